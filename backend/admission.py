@@ -0,0 +1,234 @@
+"""
+准入控制
+
+请求按路由分到不同通道（interactive / write / auth / heavy），
+每个通道有独立的并发上限和排队长度，所有通道共享全局并发上限。
+空出名额时优先放行高优先级通道的排队请求；排队已满或等待超时
+直接返回 503 + Retry-After，避免突发的注册/导出拖慢普通页面加载。
+"""
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import heapq
+import itertools
+import json
+import time
+from config import settings
+import tracing
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Lane:
+    """一个准入通道及其统计"""
+
+    def __init__(self, name: str, priority: int, limit: int, max_queue: int):
+        self.name = name
+        self.priority = priority
+        self.limit = limit
+        self.max_queue = max_queue
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.wait_total_ms = 0.0
+        self.wait_max_ms = 0.0
+
+    def record_wait(self, wait_ms: float) -> None:
+        self.admitted += 1
+        self.wait_total_ms += wait_ms
+        self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+
+    def stats(self) -> dict:
+        return {
+            "active": self.active,
+            "waiting": self.waiting,
+            "limit": self.limit,
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "wait_avg_ms": round(self.wait_total_ms / self.admitted, 3) if self.admitted else 0.0,
+            "wait_max_ms": round(self.wait_max_ms, 3),
+        }
+
+
+class AdmissionRejected(Exception):
+    """排队已满或等待超时"""
+
+
+class AdmissionController:
+    """按优先级分配全局并发名额的准入控制器（单事件循环内使用）"""
+
+    def __init__(self, max_concurrency: int, lanes: List[Lane], queue_timeout: float):
+        self.max_concurrency = max_concurrency
+        self.queue_timeout = queue_timeout
+        self.lanes: Dict[str, Lane] = {lane.name: lane for lane in lanes}
+        self.active = 0
+        # (优先级, 序号, 通道, future)，优先级数字越小越先放行
+        self._waiters: List[Tuple[int, int, Lane, asyncio.Future]] = []
+        self._seq = itertools.count()
+
+    def _has_capacity(self, lane: Lane) -> bool:
+        return self.active < self.max_concurrency and lane.active < lane.limit
+
+    def _admit(self, lane: Lane) -> None:
+        self.active += 1
+        lane.active += 1
+
+    def _has_waiter_ahead(self, lane: Lane) -> bool:
+        """
+        同等或更高优先级、且自身通道有空位的请求仍在排队时，新请求不能插队；
+        因自身通道已满而排队的请求不占用其他通道的名额
+        """
+        return any(
+            p <= lane.priority and not f.done() and waiter_lane.active < waiter_lane.limit
+            for p, _, waiter_lane, f in self._waiters
+        )
+
+    async def acquire(self, lane_name: str) -> float:
+        """获取名额，返回排队等待毫秒数；被拒绝时抛出 AdmissionRejected"""
+        lane = self.lanes[lane_name]
+        start = time.monotonic()
+
+        if self._has_capacity(lane) and not self._has_waiter_ahead(lane):
+            self._admit(lane)
+            lane.record_wait(0.0)
+            return 0.0
+
+        if lane.waiting >= lane.max_queue:
+            lane.rejected += 1
+            raise AdmissionRejected(lane_name)
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (lane.priority, next(self._seq), lane, future))
+        lane.waiting += 1
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            # 超时的同时恰好被放行时按放行处理
+            if not future.done():
+                future.cancel()
+                lane.rejected += 1
+                raise AdmissionRejected(lane_name)
+        except BaseException:
+            # 客户端断开等情况：已分到的名额要归还，否则取消排队
+            if future.done() and not future.cancelled():
+                self.release(lane_name)
+            else:
+                future.cancel()
+            raise
+        finally:
+            lane.waiting -= 1
+
+        wait_ms = (time.monotonic() - start) * 1000
+        lane.record_wait(wait_ms)
+        return wait_ms
+
+    def release(self, lane_name: str) -> None:
+        lane = self.lanes[lane_name]
+        self.active -= 1
+        lane.active -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """按优先级放行排队请求；某通道已满时跳过它，继续放行其他通道"""
+        skipped = []
+        while self._waiters and self.active < self.max_concurrency:
+            item = heapq.heappop(self._waiters)
+            _, _, lane, future = item
+            if future.done():
+                continue
+            if lane.active >= lane.limit:
+                skipped.append(item)
+                continue
+            self._admit(lane)
+            future.set_result(None)
+        for item in skipped:
+            heapq.heappush(self._waiters, item)
+
+    def stats(self) -> dict:
+        return {
+            "active": self.active,
+            "max_concurrency": self.max_concurrency,
+            "lanes": {name: lane.stats() for name, lane in self.lanes.items()},
+        }
+
+
+def build_controller() -> AdmissionController:
+    """根据配置创建准入控制器"""
+    return AdmissionController(
+        max_concurrency=settings.ADMISSION_MAX_CONCURRENCY,
+        queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+        lanes=[
+            Lane("interactive", 0, settings.ADMISSION_MAX_CONCURRENCY, settings.ADMISSION_INTERACTIVE_QUEUE),
+            Lane("write", 1, settings.ADMISSION_WRITE_LIMIT, settings.ADMISSION_WRITE_QUEUE),
+            Lane("auth", 2, settings.ADMISSION_AUTH_LIMIT, settings.ADMISSION_AUTH_QUEUE),
+            Lane("heavy", 3, settings.ADMISSION_HEAVY_LIMIT, settings.ADMISSION_HEAVY_QUEUE),
+        ],
+    )
+
+
+controller = build_controller()
+
+# 路径前缀 -> 通道（按顺序匹配）
+HEAVY_PREFIXES = ("/api/reports", "/api/analytics", "/api/maintenance", "/api/archives/bulk")
+AUTH_PATHS = ("/api/auth/login", "/api/auth/register")
+EXEMPT_PATHS = ("/health",)
+
+
+def classify(method: str, path: str) -> Optional[str]:
+    """返回请求所属通道，不受限的请求返回 None"""
+    if path in EXEMPT_PATHS or method == "OPTIONS":
+        return None
+    if path.startswith(HEAVY_PREFIXES):
+        return "heavy"
+    if path in AUTH_PATHS:
+        return "auth"
+    if method in ("GET", "HEAD"):
+        return "interactive"
+    return "write"
+
+
+class AdmissionMiddleware:
+    """ASGI 准入控制中间件"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.ADMISSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        lane = classify(scope["method"], scope["path"])
+        if lane is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            wait_ms = await controller.acquire(lane)
+        except AdmissionRejected:
+            logger.warning(f"准入控制拒绝请求: lane={lane} path={scope['path']}")
+            await self._reject(send)
+            return
+
+        # 记录在请求的根 span 上，随整条链路一起导出
+        tracing.set_attributes(**{"admission.lane": lane, "admission.wait_ms": round(wait_ms, 3)})
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.release(lane)
+
+    @staticmethod
+    async def _reject(send) -> None:
+        body = json.dumps({"detail": "服务繁忙，请稍后重试"}, ensure_ascii=False).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(settings.ADMISSION_RETRY_AFTER_SECONDS).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,28 @@
+"""
+群体统计 API 路由
+"""
+from fastapi import APIRouter, HTTPException, Depends, Query
+from typing import Literal, Optional
+from api.auth import get_current_counsellor_id
+from service import analytics_service
+
+router = APIRouter(prefix="/analytics", tags=["统计"])
+
+
+@router.get("/cohort", summary="群体统计")
+async def get_cohort(
+    group_by: Literal["university", "major", "grade"] = Query("major", description="分组维度"),
+    university: Optional[str] = Query(None, description="学校筛选"),
+    major: Optional[str] = Query(None, description="专业筛选"),
+    grade: Optional[str] = Query(None, description="年级筛选"),
+    counsellor_id: str = Depends(get_current_counsellor_id)
+):
+    """
+    按维度和学期统计学生的奖励、处分、证书数量
+    """
+    result = analytics_service.get_cohort_stats(group_by, university, major, grade)
+
+    if not result["success"]:
+        raise HTTPException(status_code=500, detail=result.get("error", "统计失败"))
+
+    return result["data"]
@@ -2,26 +2,79 @@
 档案 API 路由
 """
 from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.concurrency import run_in_threadpool
 from typing import Optional, List
 from api.auth import get_current_user_id
-from schema.archive import ArchiveItem, ArchiveCreate, ArchiveUpdate
+from api.responses import TrustedJSONResponse
+from schema.archive import (
+    ArchiveItem, ArchiveCreate, ArchiveUpdate,
+    ArchiveBulkCreate, ArchiveBulkCreateResult, ArchiveBulkDelete, ArchiveBulkCategory,
+)
 from service import archive_service
 
 router = APIRouter(prefix="/archives", tags=["档案"])
 
 
-@router.get("", summary="获取档案列表")
+@router.get("", response_model=List[ArchiveItem], summary="获取档案列表")
 async def get_archives(
     category: Optional[str] = Query(None, description="分类筛选"),
     user_id: str = Depends(get_current_user_id)
-) -> List[dict]:
+):
     """
     获取当前用户的档案列表
     """
-    return archive_service.get_archives(user_id, category)
+    return TrustedJSONResponse(archive_service.get_archives(user_id, category))
+
+
+@router.post("/bulk", response_model=ArchiveBulkCreateResult, summary="批量创建档案")
+async def bulk_create_archives(
+    data: ArchiveBulkCreate,
+    user_id: str = Depends(get_current_user_id)
+):
+    """
+    批量创建档案，重复提交的档案返回已有记录
+    """
+    result = await run_in_threadpool(archive_service.create_archives, user_id, data.items)
+    
+    if not result["success"]:
+        raise HTTPException(status_code=400, detail=result.get("error", "创建失败"))
+    
+    return {"created": result["created"], "duplicates": result["duplicates"]}
+
+
+@router.post("/bulk-delete", summary="批量删除档案")
+async def bulk_delete_archives(
+    data: ArchiveBulkDelete,
+    user_id: str = Depends(get_current_user_id)
+):
+    """
+    批量删除指定档案
+    """
+    result = archive_service.delete_archives(data.archive_ids, user_id)
+    
+    if not result["success"]:
+        raise HTTPException(status_code=400, detail=result.get("error", "删除失败"))
+    
+    return {"message": "删除成功", "deleted": result["deleted"]}
+
+
+@router.put("/bulk-category", response_model=List[ArchiveItem], summary="批量修改档案分类")
+async def bulk_update_category(
+    data: ArchiveBulkCategory,
+    user_id: str = Depends(get_current_user_id)
+):
+    """
+    批量修改指定档案的分类
+    """
+    result = archive_service.update_archives_category(data.archive_ids, user_id, data.category)
+    
+    if not result["success"]:
+        raise HTTPException(status_code=400, detail=result.get("error", "更新失败"))
+    
+    return result["data"]
 
 
-@router.get("/{archive_id}", summary="获取档案详情")
+@router.get("/{archive_id}", response_model=ArchiveItem, summary="获取档案详情")
 async def get_archive(
     archive_id: str,
     user_id: str = Depends(get_current_user_id)
@@ -37,15 +90,15 @@ async def get_archive(
     return archive
 
 
-@router.post("", summary="创建档案")
+@router.post("", response_model=ArchiveItem, summary="创建档案")
 async def create_archive(
     data: ArchiveCreate,
     user_id: str = Depends(get_current_user_id)
 ):
     """
-    创建新的档案记录
+    创建新的档案记录，重复提交时返回已有档案
     """
-    result = archive_service.create_archive(user_id, data)
+    result = await run_in_threadpool(archive_service.create_archive, user_id, data)
     
     if not result["success"]:
         raise HTTPException(status_code=400, detail=result.get("error", "创建失败"))
@@ -53,7 +106,7 @@ async def create_archive(
     return result["data"]
 
 
-@router.put("/{archive_id}", summary="更新档案")
+@router.put("/{archive_id}", response_model=ArchiveItem, summary="更新档案")
 async def update_archive(
     archive_id: str,
     updates: ArchiveUpdate,
@@ -2,15 +2,17 @@
 认证 API 路由
 """
 from fastapi import APIRouter, HTTPException, Depends, Header
+from fastapi.concurrency import run_in_threadpool
 from typing import Optional
 from schema.auth import UserRegister, UserLogin, Token
+from schema.user import UserProfile
 from service import auth_service
 
 router = APIRouter(prefix="/auth", tags=["认证"])
 
 
-def get_current_user_id(authorization: Optional[str] = Header(None)) -> str:
-    """从请求头获取当前用户ID"""
+def _get_current_user(authorization: Optional[str]) -> dict:
+    """从请求头解析令牌并获取当前用户（id 和角色）"""
     if not authorization:
         raise HTTPException(status_code=401, detail="未提供认证信息")
     
@@ -25,15 +27,42 @@ def get_current_user_id(authorization: Optional[str] = Header(None)) -> str:
     if not user:
         raise HTTPException(status_code=401, detail="无效的认证信息")
     
+    return user
+
+
+def get_current_user_id(authorization: Optional[str] = Header(None)) -> str:
+    """从请求头获取当前用户ID"""
+    return _get_current_user(authorization)["id"]
+
+
+def _get_current_user_id_with_role(authorization: Optional[str], role: str) -> str:
+    """获取当前用户ID并校验角色，角色不符返回 403"""
+    user = _get_current_user(authorization)
+
+    if user.get("role") != role:
+        raise HTTPException(status_code=403, detail="无访问权限")
+
     return user["id"]
 
 
+def get_current_reviewer_id(authorization: Optional[str] = Header(None)) -> str:
+    """从请求头获取当前审核员ID"""
+    return _get_current_user_id_with_role(authorization, "reviewer")
+
+
+def get_current_counsellor_id(authorization: Optional[str] = Header(None)) -> str:
+    """从请求头获取当前辅导员ID"""
+    return _get_current_user_id_with_role(authorization, "counsellor")
+
+
 @router.post("/register", summary="用户注册")
 async def register(data: UserRegister):
     """
     注册新用户
     """
-    result = auth_service.register_user(
+    # bcrypt 计算放到线程池，不阻塞事件循环
+    result = await run_in_threadpool(
+        auth_service.register_user,
         phone=data.phone,
         password=data.password,
         name=data.name
@@ -50,7 +79,7 @@ async def login(data: UserLogin):
     """
     用户登录，返回访问令牌
     """
-    result = auth_service.login_user(phone=data.phone, password=data.password)
+    result = await run_in_threadpool(auth_service.login_user, phone=data.phone, password=data.password)
     
     if not result["success"]:
         raise HTTPException(status_code=401, detail=result.get("error", "登录失败"))
@@ -70,7 +99,7 @@ async def logout(user_id: str = Depends(get_current_user_id)):
     return {"message": "注销成功"}
 
 
-@router.get("/me", summary="获取当前用户")
+@router.get("/me", response_model=UserProfile, summary="获取当前用户")
 async def get_me(user_id: str = Depends(get_current_user_id)):
     """
     获取当前登录用户信息
@@ -0,0 +1,53 @@
+"""
+运维任务 API 路由
+"""
+from fastapi import APIRouter, HTTPException, Depends, Header
+from typing import Optional
+from config import settings
+import admission
+from service import notification_service, sync_service
+
+router = APIRouter(prefix="/maintenance", tags=["运维任务"])
+
+
+def verify_cron_secret(authorization: Optional[str] = Header(None)) -> None:
+    """校验定时任务密钥（Vercel Cron 会携带 Authorization: Bearer <CRON_SECRET>）"""
+    if not settings.CRON_SECRET:
+        raise HTTPException(status_code=403, detail="未配置定时任务密钥")
+
+    if authorization != f"Bearer {settings.CRON_SECRET}":
+        raise HTTPException(status_code=401, detail="无效的任务密钥")
+
+
+@router.get("/notifications/retention", summary="执行通知保留任务")
+async def notification_retention(_: None = Depends(verify_cron_secret)):
+    """
+    合并重复的已读状态通知，并将已读旧通知分批移入冷表
+    """
+    result = notification_service.run_notification_retention()
+
+    if not result["success"]:
+        raise HTTPException(status_code=500, detail=result.get("error", "任务执行失败"))
+
+    return {"compacted": result["compacted"], "archived": result["archived"]}
+
+
+@router.get("/sync/tombstones", summary="清理同步删除标记")
+async def prune_sync_tombstones(_: None = Depends(verify_cron_secret)):
+    """
+    清理超过保留期的删除标记
+    """
+    result = sync_service.prune_tombstones()
+
+    if not result["success"]:
+        raise HTTPException(status_code=500, detail=result.get("error", "任务执行失败"))
+
+    return {"pruned": result["pruned"]}
+
+
+@router.get("/admission", summary="准入控制统计")
+async def admission_stats(_: None = Depends(verify_cron_secret)):
+    """
+    查看当前进程各通道的并发、排队与等待时间统计
+    """
+    return admission.controller.stats()
@@ -1,22 +1,24 @@
 """
 通知 API 路由
 """
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, HTTPException, Depends
 from typing import List
 from api.auth import get_current_user_id
+from api.responses import TrustedJSONResponse
+from schema.notification import Notification, NotificationBulkRead
 from service import notification_service
 
 router = APIRouter(prefix="/notifications", tags=["通知"])
 
 
-@router.get("", summary="获取通知列表")
+@router.get("", response_model=List[Notification], summary="获取通知列表")
 async def get_notifications(
     user_id: str = Depends(get_current_user_id)
-) -> List[dict]:
+):
     """
     获取当前用户的所有通知
     """
-    return notification_service.get_notifications(user_id)
+    return TrustedJSONResponse(notification_service.get_notifications(user_id))
 
 
 @router.put("/{notification_id}/read", summary="标记通知已读")
@@ -31,6 +33,22 @@ async def mark_read(
     return {"message": "已标记为已读"}
 
 
+@router.put("/read", summary="批量标记通知已读")
+async def mark_many_read(
+    data: NotificationBulkRead,
+    user_id: str = Depends(get_current_user_id)
+):
+    """
+    批量标记指定通知为已读
+    """
+    result = notification_service.mark_notifications_read(data.notification_ids, user_id)
+    
+    if not result["success"]:
+        raise HTTPException(status_code=400, detail=result.get("error", "标记失败"))
+    
+    return {"message": "已标记为已读", "updated": result["updated"]}
+
+
 @router.put("/read-all", summary="标记所有通知已读")
 async def mark_all_read(user_id: str = Depends(get_current_user_id)):
     """
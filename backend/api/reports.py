@@ -0,0 +1,65 @@
+"""
+成长报告 API 路由
+"""
+from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import FileResponse
+from api.auth import get_current_user_id
+from config import settings
+from service import report_service
+
+
+def require_report_host():
+    """
+    成长报告需要常驻的渲染进程池和本地缓存目录，
+    无服务器环境（请求结束即冻结、实例间不共享 /tmp）不提供该功能
+    """
+    if not settings.REPORTS_ENABLED:
+        raise HTTPException(status_code=503, detail="当前部署环境不支持生成成长报告")
+
+
+router = APIRouter(prefix="/reports", tags=["成长报告"], dependencies=[Depends(require_report_host)])
+
+
+@router.post("", summary="申请生成成长报告")
+async def submit_report(user_id: str = Depends(get_current_user_id)):
+    """
+    提交成长报告生成任务，档案未变化时直接返回已生成的报告
+    """
+    result = report_service.submit_report(user_id)
+
+    if not result["success"]:
+        raise HTTPException(status_code=400, detail=result.get("error", "提交失败"))
+
+    return result["data"]
+
+
+@router.get("/{job_id}", summary="查询成长报告状态")
+async def get_report_status(
+    job_id: str,
+    user_id: str = Depends(get_current_user_id)
+):
+    """
+    查询报告生成状态：done / running / failed
+    """
+    status = report_service.get_report_status(user_id, job_id)
+
+    if status is None:
+        raise HTTPException(status_code=404, detail="报告不存在")
+
+    return {"job_id": job_id, "status": status}
+
+
+@router.get("/{job_id}/download", summary="下载成长报告")
+async def download_report(
+    job_id: str,
+    user_id: str = Depends(get_current_user_id)
+):
+    """
+    下载已生成的成长报告 PDF
+    """
+    path = report_service.get_report_path(user_id, job_id)
+
+    if not path:
+        raise HTTPException(status_code=404, detail="报告不存在或尚未生成")
+
+    return FileResponse(path, media_type="application/pdf", filename="growth-report.pdf")
@@ -0,0 +1,18 @@
+"""
+API 响应工具
+"""
+from typing import Any
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+
+class TrustedJSONResponse(JSONResponse):
+    """
+    直接序列化数据库返回的行，不经过 Pydantic 校验和 jsonable_encoder
+
+    仅用于字段已由查询限定（如 ARCHIVE_COLUMNS）的可信数据；
+    路由仍声明 response_model 以生成接口文档。
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
@@ -0,0 +1,37 @@
+"""
+审核 API 路由
+"""
+from fastapi import APIRouter, HTTPException, Depends
+from typing import List
+from api.auth import get_current_reviewer_id
+from schema.review import ReviewClaim, ReviewDecision
+from service import review_service
+
+router = APIRouter(prefix="/reviews", tags=["审核"])
+
+
+@router.post("/claim", summary="领取待审核档案")
+async def claim_archives(
+    data: ReviewClaim,
+    reviewer_id: str = Depends(get_current_reviewer_id)
+) -> List[dict]:
+    """
+    领取一批待审核档案，租约期内其他审核员不会领取到同一档案
+    """
+    return review_service.claim_pending_archives(reviewer_id, data.batch_size)
+
+
+@router.post("/decide", summary="批量审核档案")
+async def decide_archives(
+    data: ReviewDecision,
+    reviewer_id: str = Depends(get_current_reviewer_id)
+):
+    """
+    批量通过或拒绝已领取的档案
+    """
+    result = review_service.review_archives(reviewer_id, data.archive_ids, data.status)
+
+    if not result["success"]:
+        raise HTTPException(status_code=400, detail=result.get("error", "审核失败"))
+
+    return {"message": "审核完成", "updated": result["updated"]}
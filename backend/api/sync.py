@@ -0,0 +1,25 @@
+"""
+增量同步 API 路由
+"""
+from fastapi import APIRouter, HTTPException, Depends, Query
+from typing import Optional
+from api.auth import get_current_user_id
+from service import sync_service
+
+router = APIRouter(prefix="/sync", tags=["同步"])
+
+
+@router.get("", summary="增量同步")
+async def sync(
+    since: Optional[str] = Query(None, description="上次同步返回的游标"),
+    user_id: str = Depends(get_current_user_id)
+):
+    """
+    返回游标之后新增、修改和删除的档案与通知，以及下一次同步使用的游标
+    """
+    result = sync_service.get_changes(user_id, since)
+
+    if not result["success"]:
+        raise HTTPException(status_code=500, detail=result.get("error", "同步失败"))
+
+    return result["data"]
@@ -9,7 +9,7 @@ from service import user_service
 router = APIRouter(prefix="/users", tags=["用户"])
 
 
-@router.get("/profile", summary="获取用户资料")
+@router.get("/profile", response_model=UserProfile, summary="获取用户资料")
 async def get_profile(user_id: str = Depends(get_current_user_id)):
     """
     获取当前用户的详细资料
@@ -22,7 +22,7 @@ async def get_profile(user_id: str = Depends(get_current_user_id)):
     return profile
 
 
-@router.put("/profile", summary="更新用户资料")
+@router.put("/profile", response_model=UserProfile, summary="更新用户资料")
 async def update_profile(
     updates: UserProfileUpdate,
     user_id: str = Depends(get_current_user_id)
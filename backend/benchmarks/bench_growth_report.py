@@ -0,0 +1,49 @@
+"""
+成长报告渲染耗时基准
+
+用法: python benchmarks/bench_growth_report.py [条目数 ...]
+默认测量 10 / 100 / 1000 条档案的渲染耗时（取多次运行的最小值）
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from service.growth_report import render_growth_report  # noqa: E402
+
+CATEGORIES = ["学业", "实践", "奖惩", "证书"]
+REPEAT = 3
+
+
+def make_archives(count: int) -> list:
+    return [
+        {
+            "id": str(i),
+            "title": f"全国大学生英语竞赛二等奖 {i}",
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "organization": "高等学校大学外语教学研究会",
+            "date": f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+        }
+        for i in range(count)
+    ]
+
+
+def main(sizes: list) -> None:
+    profile = {"name": "张三", "student_id": "20240001", "grade": "大二", "major": "计算机科学与技术", "university": "示例大学"}
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'条目数':>8} {'耗时(s)':>10} {'文件大小(KB)':>14}")
+        for size in sizes:
+            archives = make_archives(size)
+            path = os.path.join(tmp, f"report-{size}.pdf")
+            best = float("inf")
+            for _ in range(REPEAT):
+                start = time.perf_counter()
+                render_growth_report(profile, archives, path)
+                best = min(best, time.perf_counter() - start)
+            print(f"{size:>8} {best:>10.3f} {os.path.getsize(path) / 1024:>14.1f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10, 100, 1000])
@@ -0,0 +1,80 @@
+"""
+档案列表响应序列化耗时基准
+
+用法: python benchmarks/bench_responses.py [条目数]
+默认 500 条，对比三种序列化路径（取多次运行的最小值）：
+- jsonable_encoder + JSONResponse（FastAPI 默认路径，含 response_model 校验）
+- TypeAdapter 校验 + dump_json
+- TrustedJSONResponse（跳过校验，直接 to_json）
+"""
+import os
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+from api.responses import TrustedJSONResponse  # noqa: E402
+from schema.archive import ArchiveItem  # noqa: E402
+
+CATEGORIES = ["学业", "实践", "奖惩", "证书"]
+REPEAT = 20
+
+
+def make_rows(count: int) -> list:
+    return [
+        {
+            "id": f"00000000-0000-0000-0000-{i:012d}",
+            "user_id": "00000000-0000-0000-0000-000000000001",
+            "title": f"全国大学生英语竞赛二等奖 {i}",
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "organization": "高等学校大学外语教学研究会",
+            "date": f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+            "status": "approved",
+            "image_url": "",
+            "description": "",
+            "created_at": "2024-05-01T08:00:00+00:00",
+            "updated_at": "2024-05-01T08:00:00+00:00",
+        }
+        for i in range(count)
+    ]
+
+
+def best_of(fn) -> float:
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(count: int) -> None:
+    rows = make_rows(count)
+    adapter = TypeAdapter(List[ArchiveItem])
+
+    def default_path():
+        items = adapter.validate_python(rows)
+        return JSONResponse(jsonable_encoder(items)).body
+
+    def validate_and_dump():
+        return adapter.dump_json(adapter.validate_python(rows))
+
+    def trusted():
+        return TrustedJSONResponse(rows).body
+
+    print(f"{count} 条档案")
+    print(f"{'路径':<28} {'耗时(ms)':>10}")
+    for name, fn in [
+        ("jsonable_encoder", default_path),
+        ("TypeAdapter 校验 + dump", validate_and_dump),
+        ("TrustedJSONResponse", trusted),
+    ]:
+        print(f"{name:<28} {best_of(fn) * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,102 @@
+"""
+多进程扩展基准：分别以 1..N 个工作进程启动 server.py，压测 /health 与 /
+
+用法: python benchmarks/bench_workers.py [进程数 ...]
+默认测量 1 / 2 / 4 个工作进程；压测端同样使用多个进程，避免客户端先成为瓶颈
+服务端需要可导入 main（SUPABASE_URL / SUPABASE_KEY 等环境变量），这两个路径不访问数据库
+"""
+import asyncio
+import multiprocessing
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PATHS = ["/health", "/"]
+CLIENT_PROCESSES = 4
+CONNECTIONS_PER_CLIENT = 32
+DURATION_SECONDS = 10
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workers: int, port: int) -> subprocess.Popen:
+    env = dict(os.environ, HOST="127.0.0.1", PORT=str(port), WEB_CONCURRENCY=str(workers))
+    process = subprocess.Popen(
+        [sys.executable, "server.py"], cwd=BACKEND_DIR, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f"server.py 未能在 30 秒内启动 (workers={workers})")
+
+
+async def _connection(client: httpx.AsyncClient, path: str, stop_at: float, latencies: list) -> int:
+    errors = 0
+    while time.monotonic() < stop_at:
+        start = time.perf_counter()
+        try:
+            response = await client.get(path)
+            if response.status_code != 200:
+                errors += 1
+        except httpx.HTTPError:
+            errors += 1
+        latencies.append(time.perf_counter() - start)
+    return errors
+
+
+async def _client(base_url: str, path: str) -> tuple:
+    latencies = []
+    limits = httpx.Limits(max_connections=CONNECTIONS_PER_CLIENT)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=10) as client:
+        stop_at = time.monotonic() + DURATION_SECONDS
+        errors = await asyncio.gather(*(
+            _connection(client, path, stop_at, latencies) for _ in range(CONNECTIONS_PER_CLIENT)
+        ))
+    return latencies, sum(errors)
+
+
+def run_client(args: tuple) -> tuple:
+    return asyncio.run(_client(*args))
+
+
+def measure(port: int, path: str) -> tuple:
+    with multiprocessing.Pool(CLIENT_PROCESSES) as pool:
+        results = pool.map(run_client, [(f"http://127.0.0.1:{port}", path)] * CLIENT_PROCESSES)
+    latencies = sorted(latency for client_latencies, _ in results for latency in client_latencies)
+    errors = sum(client_errors for _, client_errors in results)
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    return len(latencies) / DURATION_SECONDS, statistics.median(latencies) * 1000, p99 * 1000, errors
+
+
+def main(worker_counts: list) -> None:
+    print(f"{'进程数':>6} {'路径':>8} {'请求/s':>10} {'p50(ms)':>9} {'p99(ms)':>9} {'错误':>6}")
+    for workers in worker_counts:
+        port = free_port()
+        server = start_server(workers, port)
+        try:
+            for path in PATHS:
+                rps, p50, p99, errors = measure(port, path)
+                print(f"{workers:>6} {path:>8} {rps:>10.0f} {p50:>9.2f} {p99:>9.2f} {errors:>6}")
+        finally:
+            server.terminate()
+            server.wait(timeout=60)
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1, 2, 4])
@@ -2,6 +2,7 @@
 后端配置模块
 """
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -12,9 +13,71 @@ class Settings:
     SUPABASE_URL: str = os.getenv("SUPABASE_URL", "")
     SUPABASE_KEY: str = os.getenv("SUPABASE_KEY", "")
     SUPABASE_SERVICE_ROLE_KEY: str = os.getenv("SUPABASE_SERVICE_ROLE_KEY", "")
+    # 数据库调用容错：单次超时、总时限、读请求重试、熔断与并发上限
+    SUPABASE_TIMEOUT_SECONDS: float = float(os.getenv("SUPABASE_TIMEOUT_SECONDS", "5"))
+    SUPABASE_DEADLINE_SECONDS: float = float(os.getenv("SUPABASE_DEADLINE_SECONDS", "8"))
+    SUPABASE_MAX_RETRIES: int = int(os.getenv("SUPABASE_MAX_RETRIES", "2"))
+    SUPABASE_RETRY_BASE_SECONDS: float = float(os.getenv("SUPABASE_RETRY_BASE_SECONDS", "0.1"))
+    SUPABASE_BREAKER_THRESHOLD: int = int(os.getenv("SUPABASE_BREAKER_THRESHOLD", "5"))
+    SUPABASE_BREAKER_RESET_SECONDS: float = float(os.getenv("SUPABASE_BREAKER_RESET_SECONDS", "30"))
+    SUPABASE_MAX_IN_FLIGHT: int = int(os.getenv("SUPABASE_MAX_IN_FLIGHT", "64"))
+    SUPABASE_STALE_CACHE_SIZE: int = int(os.getenv("SUPABASE_STALE_CACHE_SIZE", "1024"))
+    SUPABASE_STALE_CACHE_BYTES: int = int(os.getenv("SUPABASE_STALE_CACHE_BYTES", str(16 * 1024 * 1024)))
     SECRET_KEY: str = os.getenv("SECRET_KEY", "default-secret-key")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "1440"))
+    # 生产服务器（server.py）
+    HOST: str = os.getenv("HOST", "0.0.0.0")
+    PORT: int = int(os.getenv("PORT", "8000"))
+    # 工作进程数，0 表示按 CPU 核数自动计算
+    WEB_CONCURRENCY: int = int(os.getenv("WEB_CONCURRENCY", "0"))
+    GRACEFUL_SHUTDOWN_SECONDS: int = int(os.getenv("GRACEFUL_SHUTDOWN_SECONDS", "30"))
+    KEEP_ALIVE_SECONDS: int = int(os.getenv("KEEP_ALIVE_SECONDS", "5"))
+    # 信任其 X-Forwarded-* 头的反向代理地址，逗号分隔，"*" 表示全部信任
+    FORWARDED_ALLOW_IPS: str = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
+    # 准入控制：全局并发上限，各通道并发上限与排队长度，排队超时
+    ADMISSION_ENABLED: bool = os.getenv("ADMISSION_ENABLED", "true").lower() == "true"
+    ADMISSION_MAX_CONCURRENCY: int = int(os.getenv("ADMISSION_MAX_CONCURRENCY", "64"))
+    ADMISSION_INTERACTIVE_QUEUE: int = int(os.getenv("ADMISSION_INTERACTIVE_QUEUE", "256"))
+    ADMISSION_WRITE_LIMIT: int = int(os.getenv("ADMISSION_WRITE_LIMIT", "16"))
+    ADMISSION_WRITE_QUEUE: int = int(os.getenv("ADMISSION_WRITE_QUEUE", "64"))
+    ADMISSION_AUTH_LIMIT: int = int(os.getenv("ADMISSION_AUTH_LIMIT", "4"))
+    ADMISSION_AUTH_QUEUE: int = int(os.getenv("ADMISSION_AUTH_QUEUE", "32"))
+    ADMISSION_HEAVY_LIMIT: int = int(os.getenv("ADMISSION_HEAVY_LIMIT", "2"))
+    ADMISSION_HEAVY_QUEUE: int = int(os.getenv("ADMISSION_HEAVY_QUEUE", "8"))
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", "5"))
+    ADMISSION_RETRY_AFTER_SECONDS: int = int(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "2"))
+    # 请求追踪：采样率（0~1）、导出方式（none/file/otlp）
+    TRACE_SAMPLE_RATE: float = float(os.getenv("TRACE_SAMPLE_RATE", "0"))
+    TRACE_EXPORTER: str = os.getenv("TRACE_EXPORTER", "none")
+    TRACE_FILE: str = os.getenv("TRACE_FILE", "traces.jsonl")
+    TRACE_OTLP_ENDPOINT: str = os.getenv("TRACE_OTLP_ENDPOINT", "http://localhost:4318/v1/traces")
+    TRACE_SERVICE_NAME: str = os.getenv("TRACE_SERVICE_NAME", "czda-backend")
+    # 定时任务鉴权密钥（Vercel Cron 以 Bearer 方式携带）
+    CRON_SECRET: str = os.getenv("CRON_SECRET", "")
+    # 审核队列：每次领取数量与领取租约时长
+    REVIEW_BATCH_SIZE: int = int(os.getenv("REVIEW_BATCH_SIZE", "20"))
+    REVIEW_LEASE_SECONDS: int = int(os.getenv("REVIEW_LEASE_SECONDS", "600"))
+    # 增量同步：游标回退秒数（覆盖提交延迟），删除标记保留天数
+    SYNC_CURSOR_SKEW_SECONDS: int = int(os.getenv("SYNC_CURSOR_SKEW_SECONDS", "5"))
+    SYNC_TOMBSTONE_RETENTION_DAYS: int = int(os.getenv("SYNC_TOMBSTONE_RETENTION_DAYS", "30"))
+    # 群体统计结果缓存时长（秒）
+    ANALYTICS_CACHE_SECONDS: int = int(os.getenv("ANALYTICS_CACHE_SECONDS", "300"))
+    ANALYTICS_CACHE_SIZE: int = int(os.getenv("ANALYTICS_CACHE_SIZE", "256"))
+    # 成长报告（PDF）生成
+    # 依赖常驻进程池和本地缓存目录，只能在 server.py 启动的服务上运行；
+    # 在 Vercel / Lambda 等无服务器环境默认关闭
+    SERVERLESS: bool = bool(os.getenv("VERCEL") or os.getenv("AWS_LAMBDA_FUNCTION_NAME"))
+    REPORTS_ENABLED: bool = os.getenv("REPORTS_ENABLED", "false" if SERVERLESS else "true").lower() == "true"
+    REPORT_CACHE_DIR: str = os.getenv("REPORT_CACHE_DIR", os.path.join(tempfile.gettempdir(), "czda-reports"))
+    REPORT_WORKERS: int = int(os.getenv("REPORT_WORKERS", "2"))
+    # 进行中标记超过该时长视为渲染进程已退出，允许重新提交
+    REPORT_RENDER_TIMEOUT_SECONDS: int = int(os.getenv("REPORT_RENDER_TIMEOUT_SECONDS", "300"))
+    # 通知保留策略
+    NOTIFICATION_RETENTION_DAYS: int = int(os.getenv("NOTIFICATION_RETENTION_DAYS", "90"))
+    NOTIFICATION_RETENTION_BATCH_SIZE: int = int(os.getenv("NOTIFICATION_RETENTION_BATCH_SIZE", "500"))
+    NOTIFICATION_RETENTION_MAX_BATCHES: int = int(os.getenv("NOTIFICATION_RETENTION_MAX_BATCHES", "20"))
+    NOTIFICATION_RETENTION_ARCHIVE: bool = os.getenv("NOTIFICATION_RETENTION_ARCHIVE", "true").lower() == "true"
 
 
 settings = Settings()
@@ -46,6 +46,12 @@ CREATE TABLE IF NOT EXISTS notifications (
 CREATE INDEX IF NOT EXISTS idx_archives_user_id ON archives(user_id);
 CREATE INDEX IF NOT EXISTS idx_archives_category ON archives(category);
 CREATE INDEX IF NOT EXISTS idx_notifications_user_id ON notifications(user_id);
+-- 通知列表按用户 + 时间倒序读取
+CREATE INDEX IF NOT EXISTS idx_notifications_user_created ON notifications(user_id, created_at DESC);
+-- 未读通知查询（部分索引，只包含未读行）
+CREATE INDEX IF NOT EXISTS idx_notifications_user_unread ON notifications(user_id) WHERE read = FALSE;
+-- 保留任务扫描已读旧通知
+CREATE INDEX IF NOT EXISTS idx_notifications_read_created ON notifications(created_at) WHERE read = TRUE;
 CREATE INDEX IF NOT EXISTS idx_profiles_phone ON profiles(phone);
 
 -- 创建更新时间触发器
@@ -131,3 +137,371 @@ CREATE TRIGGER archive_status_change_notification
     AFTER UPDATE ON archives
     FOR EACH ROW
     EXECUTE FUNCTION notify_archive_status_change();
+
+-- ============================================
+-- 通知保留策略
+-- 已读且超过保留期的通知分批移入冷表 notifications_archive，
+-- 重复的状态通知只保留最新一条，保持热表精简
+-- ============================================
+
+-- 创建 notifications_archive 表（通知冷表）
+CREATE TABLE IF NOT EXISTS notifications_archive (
+    id UUID PRIMARY KEY,
+    user_id UUID NOT NULL,
+    type VARCHAR(20) NOT NULL,
+    title VARCHAR(200) NOT NULL,
+    description TEXT NOT NULL,
+    read BOOLEAN DEFAULT TRUE,
+    created_at TIMESTAMP WITH TIME ZONE,
+    archived_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_notifications_archive_user_created ON notifications_archive(user_id, created_at DESC);
+
+ALTER TABLE notifications_archive ENABLE ROW LEVEL SECURITY;
+CREATE POLICY "允许所有操作" ON notifications_archive FOR ALL USING (true) WITH CHECK (true);
+
+-- 分批归档已读旧通知，返回本批处理的行数
+-- p_move_to_archive = FALSE 时直接删除，不写冷表
+CREATE OR REPLACE FUNCTION archive_read_notifications(
+    p_older_than_days INTEGER,
+    p_batch_size INTEGER,
+    p_move_to_archive BOOLEAN DEFAULT TRUE
+)
+RETURNS INTEGER AS $$
+DECLARE
+    affected INTEGER;
+BEGIN
+    IF p_move_to_archive THEN
+        WITH moved AS (
+            DELETE FROM notifications
+            WHERE id IN (
+                SELECT id FROM notifications
+                WHERE read = TRUE
+                  AND created_at < NOW() - make_interval(days => p_older_than_days)
+                ORDER BY created_at
+                LIMIT p_batch_size
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING id, user_id, type, title, description, read, created_at
+        )
+        INSERT INTO notifications_archive (id, user_id, type, title, description, read, created_at)
+        SELECT id, user_id, type, title, description, read, created_at FROM moved
+        ON CONFLICT (id) DO NOTHING;
+    ELSE
+        DELETE FROM notifications
+        WHERE id IN (
+            SELECT id FROM notifications
+            WHERE read = TRUE
+              AND created_at < NOW() - make_interval(days => p_older_than_days)
+            ORDER BY created_at
+            LIMIT p_batch_size
+            FOR UPDATE SKIP LOCKED
+        );
+    END IF;
+
+    GET DIAGNOSTICS affected = ROW_COUNT;
+    RETURN affected;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 合并重复的已读状态通知：同一用户标题 + 内容相同的已读通知只保留最新一条
+-- 通知不关联档案 id，不同档案可能同名，因此未读通知一律保留，避免删除用户尚未看到的状态变更
+-- 返回本批删除的行数
+CREATE OR REPLACE FUNCTION compact_status_notifications(p_batch_size INTEGER)
+RETURNS INTEGER AS $$
+DECLARE
+    affected INTEGER;
+BEGIN
+    DELETE FROM notifications
+    WHERE id IN (
+        SELECT id FROM (
+            SELECT id,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY user_id, title, description
+                       ORDER BY created_at DESC
+                   ) AS rn
+            FROM notifications
+            WHERE type = 'status' AND read = TRUE
+        ) ranked
+        WHERE ranked.rn > 1
+        LIMIT p_batch_size
+    );
+
+    GET DIAGNOSTICS affected = ROW_COUNT;
+    RETURN affected;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================
+-- 审核队列
+-- 审核员按创建时间分批领取待审核档案（SKIP LOCKED 租约），
+-- 批量通过/拒绝后由 notify_archive_status_change 触发器发送通知
+-- ============================================
+
+-- 用户角色：student（学生）/ reviewer（审核员）
+ALTER TABLE profiles ADD COLUMN IF NOT EXISTS role VARCHAR(20) DEFAULT 'student' CHECK (role IN ('student', 'reviewer'));
+
+-- 审核领取信息
+ALTER TABLE archives ADD COLUMN IF NOT EXISTS review_claimed_by UUID REFERENCES profiles(id) ON DELETE SET NULL;
+ALTER TABLE archives ADD COLUMN IF NOT EXISTS review_claimed_until TIMESTAMP WITH TIME ZONE;
+
+-- 待审核队列索引（部分索引，只包含 pending 行）
+CREATE INDEX IF NOT EXISTS idx_archives_review_queue ON archives(created_at) WHERE status = 'pending';
+
+-- 领取一批待审核档案：跳过已被其他审核员锁定或租约未过期的行
+CREATE OR REPLACE FUNCTION claim_pending_archives(
+    p_reviewer_id UUID,
+    p_batch_size INTEGER,
+    p_lease_seconds INTEGER
+)
+RETURNS SETOF archives AS $$
+BEGIN
+    RETURN QUERY
+    UPDATE archives
+    SET review_claimed_by = p_reviewer_id,
+        review_claimed_until = NOW() + make_interval(secs => p_lease_seconds)
+    WHERE id IN (
+        SELECT id FROM archives
+        WHERE status = 'pending'
+          AND (review_claimed_until IS NULL
+               OR review_claimed_until < NOW()
+               OR review_claimed_by = p_reviewer_id)
+        ORDER BY created_at
+        LIMIT p_batch_size
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING *;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================
+-- 增量同步
+-- 客户端按游标拉取变更：新增/修改通过 updated_at 识别，
+-- 删除通过 sync_tombstones 删除标记识别
+-- ============================================
+
+-- notifications 表补充 updated_at（标记已读等修改也需要同步）
+ALTER TABLE notifications ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW();
+
+DROP TRIGGER IF EXISTS update_notifications_updated_at ON notifications;
+CREATE TRIGGER update_notifications_updated_at
+    BEFORE UPDATE ON notifications
+    FOR EACH ROW
+    EXECUTE FUNCTION update_updated_at_column();
+
+CREATE INDEX IF NOT EXISTS idx_archives_user_updated ON archives(user_id, updated_at);
+CREATE INDEX IF NOT EXISTS idx_notifications_user_updated ON notifications(user_id, updated_at);
+
+-- 创建 sync_tombstones 表（删除标记）
+CREATE TABLE IF NOT EXISTS sync_tombstones (
+    id BIGSERIAL PRIMARY KEY,
+    user_id UUID NOT NULL,
+    table_name VARCHAR(50) NOT NULL,
+    record_id UUID NOT NULL,
+    deleted_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_sync_tombstones_user_deleted ON sync_tombstones(user_id, deleted_at);
+
+ALTER TABLE sync_tombstones ENABLE ROW LEVEL SECURITY;
+CREATE POLICY "允许所有操作" ON sync_tombstones FOR ALL USING (true) WITH CHECK (true);
+
+-- 删除档案/通知时记录删除标记
+CREATE OR REPLACE FUNCTION record_sync_tombstone()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO sync_tombstones (user_id, table_name, record_id)
+    VALUES (OLD.user_id, TG_TABLE_NAME, OLD.id);
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS archives_sync_tombstone ON archives;
+CREATE TRIGGER archives_sync_tombstone
+    AFTER DELETE ON archives
+    FOR EACH ROW
+    EXECUTE FUNCTION record_sync_tombstone();
+
+DROP TRIGGER IF EXISTS notifications_sync_tombstone ON notifications;
+CREATE TRIGGER notifications_sync_tombstone
+    AFTER DELETE ON notifications
+    FOR EACH ROW
+    EXECUTE FUNCTION record_sync_tombstone();
+
+-- ============================================
+-- 群体统计（辅导员按专业/年级/学校查看）
+-- 聚合在数据库中完成，只返回分组后的结果
+-- ============================================
+
+-- 辅导员角色
+ALTER TABLE profiles DROP CONSTRAINT IF EXISTS profiles_role_check;
+ALTER TABLE profiles ADD CONSTRAINT profiles_role_check CHECK (role IN ('student', 'reviewer', 'counsellor'));
+
+CREATE INDEX IF NOT EXISTS idx_archives_approved_user ON archives(user_id, category, date) WHERE status = 'approved';
+
+-- 按维度（university/major/grade）和学期统计已通过档案
+-- 奖惩类按标题关键词区分奖励与处分
+CREATE OR REPLACE FUNCTION cohort_archive_stats(
+    p_group_by TEXT,
+    p_university TEXT DEFAULT NULL,
+    p_major TEXT DEFAULT NULL,
+    p_grade TEXT DEFAULT NULL
+)
+RETURNS TABLE (
+    group_value TEXT,
+    term TEXT,
+    students BIGINT,
+    total BIGINT,
+    awards BIGINT,
+    penalties BIGINT,
+    certificates BIGINT
+) AS $$
+    WITH facts AS (
+        SELECT
+            CASE p_group_by
+                WHEN 'university' THEN p.university
+                WHEN 'major' THEN p.major
+                ELSE p.grade
+            END AS group_value,
+            CASE
+                WHEN EXTRACT(MONTH FROM a.date) >= 9
+                    THEN EXTRACT(YEAR FROM a.date)::INT || '-' || (EXTRACT(YEAR FROM a.date)::INT + 1) || ' 第一学期'
+                WHEN EXTRACT(MONTH FROM a.date) <= 1
+                    THEN (EXTRACT(YEAR FROM a.date)::INT - 1) || '-' || EXTRACT(YEAR FROM a.date)::INT || ' 第一学期'
+                ELSE (EXTRACT(YEAR FROM a.date)::INT - 1) || '-' || EXTRACT(YEAR FROM a.date)::INT || ' 第二学期'
+            END AS term,
+            a.user_id,
+            a.category,
+            a.category = '奖惩' AND a.title ~ '(处分|警告|违纪|违规|通报批评|记过)' AS is_penalty
+        FROM archives a
+        JOIN profiles p ON p.id = a.user_id
+        WHERE a.status = 'approved'
+          AND (p_university IS NULL OR p.university = p_university)
+          AND (p_major IS NULL OR p.major = p_major)
+          AND (p_grade IS NULL OR p.grade = p_grade)
+    )
+    SELECT
+        COALESCE(NULLIF(group_value, ''), '未填写') AS group_value,
+        term,
+        COUNT(DISTINCT user_id) AS students,
+        COUNT(*) AS total,
+        COUNT(*) FILTER (WHERE category = '奖惩' AND NOT is_penalty) AS awards,
+        COUNT(*) FILTER (WHERE is_penalty) AS penalties,
+        COUNT(*) FILTER (WHERE category = '证书') AS certificates
+    FROM facts
+    GROUP BY 1, 2
+    ORDER BY 1, 2;
+$$ LANGUAGE sql STABLE;
+
+-- ============================================
+-- 重复提交检测
+-- 指纹 = 规范化标题 + 颁发单位 + 日期 + 图片哈希，同一用户唯一
+-- 指纹只在数据库中计算（触发器写入、find_duplicate_archives 查询）
+-- ============================================
+
+CREATE OR REPLACE FUNCTION normalize_fingerprint_text(p_text TEXT)
+RETURNS TEXT AS $$
+    SELECT lower(btrim(regexp_replace(normalize(COALESCE(p_text, ''), NFKC), '\s+', ' ', 'g'), ' '));
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION archive_fingerprint(p_title TEXT, p_organization TEXT, p_date DATE, p_image_url TEXT)
+RETURNS TEXT AS $$
+    SELECT encode(sha256(convert_to(concat_ws(chr(31),
+        normalize_fingerprint_text(p_title),
+        normalize_fingerprint_text(p_organization),
+        COALESCE(p_date::TEXT, ''),
+        encode(sha256(convert_to(COALESCE(p_image_url, ''), 'UTF8')), 'hex')
+    ), 'UTF8')), 'hex');
+$$ LANGUAGE sql IMMUTABLE;
+
+ALTER TABLE archives ADD COLUMN IF NOT EXISTS fingerprint TEXT;
+
+-- 插入/修改时由数据库计算指纹
+CREATE OR REPLACE FUNCTION set_archive_fingerprint()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.fingerprint = archive_fingerprint(NEW.title, NEW.organization, NEW.date, NEW.image_url);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS set_archives_fingerprint ON archives;
+CREATE TRIGGER set_archives_fingerprint
+    BEFORE INSERT OR UPDATE OF title, organization, date, image_url ON archives
+    FOR EACH ROW
+    EXECUTE FUNCTION set_archive_fingerprint();
+
+-- 回填已有档案；已存在的重复档案只保留最早一条的指纹
+UPDATE archives a
+SET fingerprint = fp.fingerprint
+FROM (
+    SELECT id,
+           archive_fingerprint(title, organization, date, image_url) AS fingerprint,
+           ROW_NUMBER() OVER (
+               PARTITION BY user_id, archive_fingerprint(title, organization, date, image_url)
+               ORDER BY created_at
+           ) AS rn
+    FROM archives
+    WHERE fingerprint IS NULL
+) fp
+WHERE a.id = fp.id AND fp.rn = 1;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_archives_user_fingerprint ON archives(user_id, fingerprint);
+
+-- ============================================
+-- 档案删除通知触发器
+-- 删除档案时在同一语句内写入通知（语句级触发器，批量删除只生成一条汇总通知）
+-- ============================================
+
+CREATE OR REPLACE FUNCTION notify_archives_deleted()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO notifications (user_id, type, title, description, read, created_at)
+    SELECT
+        grouped.user_id,
+        'alert',
+        '成长数据已删除',
+        '按照您的请求，'
+            || CASE WHEN grouped.cnt = 1 THEN '条目' ELSE '' END
+            || array_to_string(grouped.titles[1:3], '、')
+            || CASE WHEN grouped.cnt > 3 THEN ' 等 ' || grouped.cnt || ' 个条目' ELSE '' END
+            || '已从您的时间轴中移除。',
+        FALSE,
+        NOW()
+    FROM (
+        SELECT user_id,
+               COUNT(*) AS cnt,
+               array_agg('"' || title || '"' ORDER BY created_at) AS titles
+        FROM deleted_archives
+        GROUP BY user_id
+    ) grouped
+    -- 账号注销级联删除时用户已不存在，不再写通知
+    WHERE EXISTS (SELECT 1 FROM profiles p WHERE p.id = grouped.user_id);
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS archives_deleted_notification ON archives;
+CREATE TRIGGER archives_deleted_notification
+    AFTER DELETE ON archives
+    REFERENCING OLD TABLE AS deleted_archives
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION notify_archives_deleted();
+
+-- 按提交内容查找已有的重复档案（p_items 为包含 title/organization/date/image_url 的数组）
+CREATE OR REPLACE FUNCTION find_duplicate_archives(p_user_id UUID, p_items JSONB)
+RETURNS SETOF archives AS $$
+    SELECT a.* FROM archives a
+    WHERE a.user_id = p_user_id
+      AND a.fingerprint IN (
+          SELECT archive_fingerprint(
+              item->>'title',
+              item->>'organization',
+              (item->>'date')::DATE,
+              item->>'image_url'
+          )
+          FROM jsonb_array_elements(p_items) AS item
+      );
+$$ LANGUAGE sql STABLE;
@@ -2,9 +2,15 @@
 大学生成长档案系统 - 后端主入口
 """
 import logging
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from api import auth, users, archives, notifications
+from fastapi.responses import JSONResponse
+from config import settings
+from repository.resilient_client import DatastoreError, DatastoreOverloaded
+import tracing
+from admission import AdmissionMiddleware
+from api import auth, users, archives, notifications, reviews, sync, analytics, reports, maintenance
 
 # 配置日志
 logging.basicConfig(
@@ -12,8 +18,21 @@ logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 )
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    进程退出前等待报告渲染完成、追踪数据导出
+    """
+    yield
+    from service import report_service
+    report_service.shutdown_report_pool()
+    tracing.shutdown_exporter()
+
+
 # 创建 FastAPI 应用
 app = FastAPI(
+    lifespan=lifespan,
     title="大学生成长档案系统",
     description="记录学业、实践、奖惩、证书等全维度成长数据",
     version="1.0.0",
@@ -21,6 +40,9 @@ app = FastAPI(
     redoc_url="/redoc"
 )
 
+# 准入控制（位于 CORS 内层，503 响应也带 CORS 头）
+app.add_middleware(AdmissionMiddleware)
+
 # 配置 CORS
 app.add_middleware(
     CORSMiddleware,
@@ -30,11 +52,48 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """
+    为每个请求分配 request id，并在采样时记录整个请求的 span
+    """
+    request_id = request.headers.get("X-Request-ID", "")[:64] or None
+    with tracing.start_trace(request_id) as trace:
+        with tracing.span(f"{request.method} {request.url.path}", **{
+            "http.method": request.method,
+            "http.target": request.url.path,
+        }) as root:
+            response = await call_next(request)
+            if root is not None:
+                root.attributes["http.status_code"] = response.status_code
+        response.headers["X-Request-ID"] = trace.request_id
+        return response
+
+
 # 注册路由
 app.include_router(auth.router, prefix="/api")
 app.include_router(users.router, prefix="/api")
 app.include_router(archives.router, prefix="/api")
 app.include_router(notifications.router, prefix="/api")
+app.include_router(reviews.router, prefix="/api")
+app.include_router(sync.router, prefix="/api")
+app.include_router(analytics.router, prefix="/api")
+app.include_router(reports.router, prefix="/api")
+app.include_router(maintenance.router, prefix="/api")
+
+
+@app.exception_handler(DatastoreError)
+async def datastore_error_handler(request: Request, exc: DatastoreError):
+    """
+    数据库不可用时快速返回 503，而不是把空结果当作"没有数据"
+    """
+    retry_after = 1 if isinstance(exc, DatastoreOverloaded) else int(settings.SUPABASE_BREAKER_RESET_SECONDS)
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "服务暂时不可用，请稍后重试"},
+        headers={"Retry-After": str(retry_after)},
+    )
 
 
 @app.get("/", tags=["根路径"])
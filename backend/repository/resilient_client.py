@@ -0,0 +1,344 @@
+"""
+带容错能力的 Supabase 客户端封装
+
+- 单次调用超时 + 整体时限
+- 只读请求按抖动退避重试
+- 熔断器：连续失败后快速失败
+- 并发上限：在途调用超过上限时直接拒绝
+- 显式允许降级的只读调用（stale_ok）在失败时返回最近一次成功的缓存结果，
+  其余调用一律抛出 DatastoreError，避免调用方把旧数据当作最新数据
+"""
+from typing import Any, Optional, Tuple
+from collections import OrderedDict
+import random
+import threading
+import time
+import httpx
+from postgrest.exceptions import APIError
+from pydantic_core import to_json
+from tracing import span
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class DatastoreError(Exception):
+    """数据库暂时不可用的基类，服务层不应吞掉此类异常"""
+
+
+class DatastoreUnavailable(DatastoreError):
+    """数据库调用失败或熔断器打开"""
+
+
+class DatastoreOverloaded(DatastoreError):
+    """在途调用数超过上限"""
+
+
+# 当前线程正在执行的调用：整体截止时间与最近一次响应的 HTTP 状态码
+_attempt = threading.local()
+
+
+def _clamp_timeout(request: httpx.Request) -> None:
+    """httpx 请求钩子：单次请求的超时不超过整体时限的剩余时间"""
+    deadline = getattr(_attempt, "deadline", None)
+    if deadline is None:
+        return
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise httpx.TimeoutException("已超过调用时限", request=request)
+    timeout = request.extensions.get("timeout", {})
+    request.extensions["timeout"] = {
+        name: remaining if value is None else min(value, remaining)
+        for name, value in timeout.items()
+    } or httpx.Timeout(remaining).as_dict()
+
+
+def _record_status(response: httpx.Response) -> None:
+    """httpx 响应钩子：记录状态码，供故障分类使用"""
+    _attempt.status = response.status_code
+
+
+def _instrument_session(session: Any) -> None:
+    """在 postgrest 的 httpx 会话上安装超时与状态码钩子（只安装一次）"""
+    if session is None or getattr(session, "_resilient_hooks_installed", False):
+        return
+    hooks = session.event_hooks
+    hooks["request"] = [*hooks.get("request", []), _clamp_timeout]
+    hooks["response"] = [*hooks.get("response", []), _record_status]
+    session.event_hooks = hooks
+    session._resilient_hooks_installed = True
+
+
+def _is_transient(error: Exception, status: Optional[int]) -> bool:
+    """网络错误、超时、5xx 响应和 PostgREST 连接类错误（PGRST000~PGRST003）视为临时故障"""
+    if isinstance(error, httpx.TransportError):
+        return True
+    if isinstance(error, APIError):
+        if status is not None and (status >= 500 or status == 429):
+            return True
+        code = str(error.code or "")
+        return code.startswith("PGRST00") or code.startswith("5")
+    return False
+
+
+class CircuitBreaker:
+    """连续失败计数熔断器：closed -> open -> half-open -> closed"""
+
+    def __init__(self, threshold: int, reset_seconds: float):
+        self.threshold = threshold
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._half_open_trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.reset_seconds:
+                return "half-open"
+            return "open"
+
+    def allow(self) -> bool:
+        """是否放行本次调用；半开状态只放行一个试探请求"""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_seconds:
+                return False
+            if self._half_open_trial:
+                return False
+            self._half_open_trial = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._half_open_trial = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._half_open_trial = False
+            if self._opened_at is not None or self._failures >= self.threshold:
+                self._opened_at = time.monotonic()
+
+
+class StaleCache:
+    """
+    按条目数和（可选）总字节数限制的 LRU 缓存
+    size 由调用方估算；超过 max_bytes 的单个条目不缓存
+    """
+
+    def __init__(self, max_size: int, max_bytes: Optional[int] = None):
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[Tuple, Tuple[Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple) -> Optional[Any]:
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key][0]
+
+    def put(self, key: Tuple, value: Any, size: int = 0) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._pop(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            self._data[key] = (value, size)
+            self._bytes += size
+            while len(self._data) > self.max_size or (
+                self.max_bytes is not None and self._bytes > self.max_bytes
+            ):
+                _, (_, evicted) = self._data.popitem(last=False)
+                self._bytes -= evicted
+
+    def discard(self, key: Tuple) -> None:
+        with self._lock:
+            self._pop(key)
+
+    def _pop(self, key: Tuple) -> None:
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+
+class CallGuard:
+    """对每次 execute() 施加时限、重试、熔断和并发限制"""
+
+    def __init__(
+        self,
+        deadline_seconds: float,
+        max_retries: int,
+        retry_base_seconds: float,
+        breaker: CircuitBreaker,
+        max_in_flight: int,
+        stale_cache: StaleCache,
+    ):
+        self.deadline_seconds = deadline_seconds
+        self.max_retries = max_retries
+        self.retry_base_seconds = retry_base_seconds
+        self.breaker = breaker
+        self.stale_cache = stale_cache
+        self._in_flight = threading.BoundedSemaphore(max_in_flight)
+
+    @staticmethod
+    def _cache_key(builder: Any) -> Tuple:
+        return (
+            getattr(builder, "http_method", ""),
+            getattr(builder, "path", ""),
+            str(getattr(builder, "params", "")),
+            str(getattr(builder, "json", "")),
+        )
+
+    @staticmethod
+    def _result_size(key: Tuple, result: Any) -> int:
+        """缓存条目的近似字节数：键 + 结果数据的 JSON 长度"""
+        data = getattr(result, "data", result)
+        return sum(len(str(part)) for part in key) + len(to_json(data, fallback=str))
+
+    def _serve_stale(self, key: Optional[Tuple], error: DatastoreError) -> Any:
+        stale = self.stale_cache.get(key) if key is not None else None
+        if stale is None:
+            raise error
+        logger.warning(f"数据库不可用，返回缓存数据: {error}")
+        return stale
+
+    def execute(self, builder: Any, read_only: bool, stale_ok: bool = False) -> Any:
+        """
+        read_only: 调用无副作用，失败时可重试
+        stale_ok: 调用方接受旧数据，成功结果写入缓存，失败时返回缓存
+        """
+        key = self._cache_key(builder) if read_only and stale_ok else None
+
+        # 先占并发名额再询问熔断器：半开状态的试探名额一经发放，
+        # 本次调用必定执行并记录成功或失败，不会因限流而丢失
+        if not self._in_flight.acquire(blocking=False):
+            error = DatastoreOverloaded("数据库调用过多")
+            if key is not None:
+                return self._serve_stale(key, error)
+            raise error
+
+        if not self.breaker.allow():
+            self._in_flight.release()
+            error = DatastoreUnavailable("数据库熔断中")
+            if key is not None:
+                return self._serve_stale(key, error)
+            raise error
+
+        try:
+            return self._execute_with_retry(builder, read_only, key)
+        finally:
+            _attempt.deadline = None
+            self._in_flight.release()
+
+    def _execute_with_retry(self, builder: Any, read_only: bool, key: Optional[Tuple]) -> Any:
+        deadline = time.monotonic() + self.deadline_seconds
+        attempts = self.max_retries + 1 if read_only else 1
+
+        _instrument_session(getattr(builder, "session", None))
+
+        for attempt in range(attempts):
+            _attempt.deadline = deadline
+            _attempt.status = None
+            try:
+                result = builder.execute()
+            except Exception as e:
+                if not _is_transient(e, _attempt.status):
+                    # 业务错误（如约束冲突）说明数据库是通的
+                    self.breaker.record_success()
+                    raise
+
+                self.breaker.record_failure()
+                logger.warning(f"数据库调用失败（第 {attempt + 1} 次）: {e}")
+
+                # 全抖动退避，且不超过剩余时限
+                backoff = random.uniform(0, self.retry_base_seconds * (2 ** attempt))
+                remaining = deadline - time.monotonic()
+                if attempt + 1 >= attempts or backoff >= remaining or not self.breaker.allow():
+                    error = DatastoreUnavailable(str(e))
+                    if key is not None:
+                        return self._serve_stale(key, error)
+                    raise error from e
+                time.sleep(backoff)
+                continue
+
+            self.breaker.record_success()
+            if key is not None:
+                self.stale_cache.put(key, result, self._result_size(key, result))
+            return result
+
+
+_OPERATIONS = {"GET": "select", "HEAD": "select", "POST": "insert", "PATCH": "update", "DELETE": "delete"}
+
+
+def _describe(path: str, method: str) -> Tuple[str, str]:
+    """由请求路径和方法得到 (表名, 操作)，存储过程为 (函数名, rpc)"""
+    parts = [p for p in str(path).split("/") if p]
+    if len(parts) >= 2 and parts[-2] == "rpc":
+        return parts[-1], "rpc"
+    return (parts[-1] if parts else ""), _OPERATIONS.get(method, method.lower())
+
+
+class GuardedQuery:
+    """代理 postgrest 请求构造器，链式调用保持不变，execute() 经过 CallGuard"""
+
+    def __init__(self, builder: Any, guard: CallGuard, read_only: bool = False, stale_ok: bool = False):
+        self._builder = builder
+        self._guard = guard
+        self._read_only = read_only
+        self._stale_ok = stale_ok
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._builder, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            if hasattr(result, "execute"):
+                return GuardedQuery(result, self._guard, self._read_only, self._stale_ok)
+            return result
+
+        return call
+
+    def stale_ok(self) -> "GuardedQuery":
+        """数据库不可用时允许返回最近一次成功的结果（仅用于可接受旧数据的展示类查询）"""
+        self._stale_ok = True
+        return self
+
+    def returning(self, columns: str) -> "GuardedQuery":
+        """写操作只返回指定列（PostgREST 的 select 参数），避免回传内部字段"""
+        self._builder.params = self._builder.params.set("select", columns)
+        return self
+
+    def execute(self) -> Any:
+        method = getattr(self._builder, "http_method", "")
+        read_only = self._read_only or method in ("GET", "HEAD")
+        table, operation = _describe(getattr(self._builder, "path", ""), method)
+        with span(f"db.{operation} {table}", **{"db.table": table, "db.operation": operation}):
+            return self._guard.execute(self._builder, read_only, self._stale_ok)
+
+
+class ResilientClient:
+    """Supabase 客户端的容错封装，接口与原客户端的 table()/rpc() 一致"""
+
+    def __init__(self, client: Any, guard: CallGuard):
+        self._client = client
+        self.guard = guard
+
+    def table(self, table_name: str) -> GuardedQuery:
+        return GuardedQuery(self._client.table(table_name), self.guard)
+
+    def rpc(self, fn: str, params: dict, read_only: bool = False, stale_ok: bool = False) -> GuardedQuery:
+        """read_only=True 表示该存储过程无副作用，可重试；stale_ok=True 表示失败时可返回缓存结果"""
+        return GuardedQuery(self._client.rpc(fn, params), self.guard, read_only, stale_ok)
@@ -2,13 +2,29 @@
 Supabase 客户端模块
 """
 from supabase import create_client, Client
+from supabase.lib.client_options import ClientOptions
 from config import settings
+from repository.resilient_client import CallGuard, CircuitBreaker, ResilientClient, StaleCache
 
 
 def get_supabase_client() -> Client:
     """获取 Supabase 客户端实例"""
-    return create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+    options = ClientOptions(postgrest_client_timeout=settings.SUPABASE_TIMEOUT_SECONDS)
+    return create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY, options=options)
+
+
+def get_resilient_client() -> ResilientClient:
+    """获取带超时、重试、熔断和并发限制的客户端实例"""
+    guard = CallGuard(
+        deadline_seconds=settings.SUPABASE_DEADLINE_SECONDS,
+        max_retries=settings.SUPABASE_MAX_RETRIES,
+        retry_base_seconds=settings.SUPABASE_RETRY_BASE_SECONDS,
+        breaker=CircuitBreaker(settings.SUPABASE_BREAKER_THRESHOLD, settings.SUPABASE_BREAKER_RESET_SECONDS),
+        max_in_flight=settings.SUPABASE_MAX_IN_FLIGHT,
+        stale_cache=StaleCache(settings.SUPABASE_STALE_CACHE_SIZE, settings.SUPABASE_STALE_CACHE_BYTES),
+    )
+    return ResilientClient(get_supabase_client(), guard)
 
 
 # 全局客户端实例
-supabase: Client = get_supabase_client()
+supabase: ResilientClient = get_resilient_client()
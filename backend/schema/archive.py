@@ -2,7 +2,7 @@
 档案相关的 Pydantic 模型
 """
 from pydantic import BaseModel, Field
-from typing import Optional, Literal
+from typing import List, Optional, Literal
 from datetime import datetime, date
 
 
@@ -32,11 +32,32 @@ class ArchiveCreate(BaseModel):
 
 
 class ArchiveUpdate(BaseModel):
-    """更新档案"""
+    """更新档案（审核状态只能通过审核接口修改）"""
     title: Optional[str] = None
     category: Optional[str] = None
     organization: Optional[str] = None
     date: Optional[str] = None
-    status: Optional[Literal["approved", "pending", "rejected"]] = None
     image_url: Optional[str] = None
     description: Optional[str] = None
+
+
+class ArchiveBulkCreate(BaseModel):
+    """批量创建档案"""
+    items: List[ArchiveCreate] = Field(..., min_length=1, max_length=100, description="档案列表")
+
+
+class ArchiveBulkCreateResult(BaseModel):
+    """批量创建结果"""
+    created: List[ArchiveItem]
+    duplicates: List[ArchiveItem]
+
+
+class ArchiveBulkDelete(BaseModel):
+    """批量删除档案"""
+    archive_ids: List[str] = Field(..., min_length=1, max_length=500, description="档案ID列表")
+
+
+class ArchiveBulkCategory(BaseModel):
+    """批量修改档案分类"""
+    archive_ids: List[str] = Field(..., min_length=1, max_length=500, description="档案ID列表")
+    category: str = Field(..., min_length=1, description="分类: 学业/实践/奖惩/证书")
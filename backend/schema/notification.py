@@ -1,8 +1,8 @@
 """
 通知相关的 Pydantic 模型
 """
-from pydantic import BaseModel
-from typing import Optional, Literal
+from pydantic import BaseModel, Field
+from typing import List, Optional, Literal
 from datetime import datetime
 
 
@@ -15,6 +15,7 @@ class Notification(BaseModel):
     description: str
     read: bool = False
     created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
 
 
 class NotificationCreate(BaseModel):
@@ -22,3 +23,8 @@ class NotificationCreate(BaseModel):
     type: Literal["certificate", "status", "milestone", "system", "alert"]
     title: str
     description: str
+
+
+class NotificationBulkRead(BaseModel):
+    """批量标记通知已读"""
+    notification_ids: List[str] = Field(..., min_length=1, max_length=500, description="通知ID列表")
@@ -0,0 +1,16 @@
+"""
+审核相关的 Pydantic 模型
+"""
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
+
+
+class ReviewClaim(BaseModel):
+    """领取待审核档案"""
+    batch_size: Optional[int] = Field(default=None, ge=1, le=200, description="领取数量")
+
+
+class ReviewDecision(BaseModel):
+    """批量审核结果"""
+    archive_ids: List[str] = Field(..., min_length=1, max_length=500, description="档案ID列表")
+    status: Literal["approved", "rejected"] = Field(..., description="审核结果")
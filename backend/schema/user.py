@@ -9,12 +9,14 @@ from datetime import datetime
 class UserProfile(BaseModel):
     """用户资料"""
     id: str
+    phone: Optional[str] = None
     name: str
     student_id: str
     avatar: Optional[str] = None
     grade: Optional[str] = None
     major: Optional[str] = None
     university: Optional[str] = None
+    role: Optional[str] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
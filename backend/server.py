@@ -0,0 +1,62 @@
+"""
+大学生成长档案系统 - 生产环境启动入口
+
+用法: python server.py
+工作进程数、端口等通过环境变量配置（见 config.Settings）
+"""
+import logging
+import os
+import importlib.util
+import uvicorn
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def get_worker_count() -> int:
+    """计算工作进程数：未配置时使用 CPU 核数"""
+    if settings.WEB_CONCURRENCY > 0:
+        return settings.WEB_CONCURRENCY
+    return max(os.cpu_count() or 1, 1)
+
+
+def get_event_loop() -> str:
+    """已安装 uvloop 时使用 uvloop，否则使用标准 asyncio"""
+    return "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+
+
+def get_http_protocol() -> str:
+    """已安装 httptools 时使用 httptools，否则使用 h11"""
+    return "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+
+def main() -> None:
+    workers = get_worker_count()
+    loop = get_event_loop()
+    http = get_http_protocol()
+
+    logger.info(f"启动生产服务器: workers={workers}, loop={loop}, http={http}")
+
+    # 收到 SIGTERM 后停止接收新连接，在超时时间内等待进行中的请求完成，
+    # 随后执行 lifespan 收尾（等待报告渲染、导出追踪数据）
+    uvicorn.run(
+        "main:app",
+        host=settings.HOST,
+        port=settings.PORT,
+        workers=workers,
+        loop=loop,
+        http=http,
+        proxy_headers=True,
+        forwarded_allow_ips=settings.FORWARDED_ALLOW_IPS,
+        timeout_keep_alive=settings.KEEP_ALIVE_SECONDS,
+        timeout_graceful_shutdown=settings.GRACEFUL_SHUTDOWN_SECONDS,
+        access_log=False,
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    main()
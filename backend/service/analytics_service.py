@@ -0,0 +1,62 @@
+"""
+群体统计服务层
+"""
+from typing import Optional
+import time
+from config import settings
+from repository.supabase_client import supabase
+from repository.resilient_client import DatastoreError, StaleCache
+from tracing import traced
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 统计结果缓存：参数 -> (过期时间, 结果)，按 LRU 限制条目数
+_cache = StaleCache(settings.ANALYTICS_CACHE_SIZE)
+
+
+@traced
+def get_cohort_stats(
+    group_by: str,
+    university: Optional[str] = None,
+    major: Optional[str] = None,
+    grade: Optional[str] = None,
+) -> dict:
+    """
+    按专业/年级/学校和学期统计已通过档案（奖励、处分、证书数量）
+    结果在进程内缓存 ANALYTICS_CACHE_SECONDS 秒；数据库不可用时由容错客户端返回最近一次结果
+    """
+    key = (group_by, university, major, grade)
+    now = time.monotonic()
+
+    cached = _cache.get(key)
+    if cached:
+        if cached[0] > now:
+            return cached[1]
+        _cache.discard(key)
+
+    try:
+        result = supabase.rpc("cohort_archive_stats", {
+            "p_group_by": group_by,
+            "p_university": university,
+            "p_major": major,
+            "p_grade": grade,
+        }, read_only=True, stale_ok=True).execute()
+
+        stats = {
+            "success": True,
+            "data": {
+                "group_by": group_by,
+                "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "rows": result.data or [],
+            },
+        }
+
+        _cache.put(key, (now + settings.ANALYTICS_CACHE_SECONDS, stats))
+        return stats
+
+    except DatastoreError:
+        raise
+    except Exception as e:
+        logger.error(f"获取群体统计失败: {e}")
+        return {"success": False, "error": str(e)}
@@ -5,96 +5,132 @@ from typing import List, Optional
 from datetime import datetime
 import uuid
 from repository.supabase_client import supabase
+from repository.resilient_client import DatastoreError
 from schema.archive import ArchiveCreate, ArchiveUpdate
 from service.notification_service import create_notification
+from tracing import traced
 import logging
 
 logger = logging.getLogger(__name__)
 
+# 返回给客户端的档案字段（不含审核领取等内部字段）
+ARCHIVE_COLUMNS = "id, user_id, title, category, organization, date, status, image_url, description, created_at, updated_at"
 
+
+def _build_archive_row(user_id: str, data: ArchiveCreate) -> dict:
+    """由创建请求构造待插入的档案行（指纹由数据库触发器计算）"""
+    return {
+        "id": str(uuid.uuid4()),
+        "user_id": user_id,
+        "title": data.title,
+        "category": data.category,
+        "organization": data.organization or "未知单位",
+        "date": data.date or datetime.now().strftime("%Y-%m-%d"),
+        "status": "pending",
+        "image_url": data.image_url or "",
+        "description": data.description or "",
+    }
+
+
+def _insert_ignoring_duplicates(rows: List[dict]) -> List[dict]:
+    """插入档案，与已有指纹冲突的行被跳过，返回实际插入的行"""
+    result = (
+        supabase.table("archives")
+        .upsert(rows, on_conflict="user_id,fingerprint", ignore_duplicates=True)
+        .returning(ARCHIVE_COLUMNS)
+        .execute()
+    )
+    return result.data or []
+
+
+def _find_existing_archives(user_id: str, rows: List[dict]) -> List[dict]:
+    """
+    查询与给定档案指纹相同的已有档案
+    指纹由数据库函数 archive_fingerprint 计算，与唯一索引使用同一规则
+    """
+    result = supabase.rpc("find_duplicate_archives", {
+        "p_user_id": user_id,
+        "p_items": [
+            {key: row[key] for key in ("title", "organization", "date", "image_url")}
+            for row in rows
+        ],
+    }, read_only=True).execute()
+    return result.data or []
+
+
+@traced
 def get_archives(user_id: str, category: Optional[str] = None) -> List[dict]:
     """
     获取用户的档案列表
     """
     try:
-        query = supabase.table("archives").select("*").eq("user_id", user_id)
+        query = supabase.table("archives").select(ARCHIVE_COLUMNS).eq("user_id", user_id)
         
         if category:
             query = query.eq("category", category)
         
-        result = query.order("created_at", desc=True).execute()
+        # 数据库不可用时允许展示最近一次成功的列表
+        result = query.order("created_at", desc=True).stale_ok().execute()
         return result.data or []
         
+    except DatastoreError:
+        raise
     except Exception as e:
         logger.error(f"获取档案列表失败: {e}")
         return []
 
 
+@traced
 def get_archive_by_id(archive_id: str, user_id: str) -> Optional[dict]:
     """
     获取档案详情
     """
     try:
-        result = supabase.table("archives").select("*").eq("id", archive_id).eq("user_id", user_id).execute()
+        result = supabase.table("archives").select(ARCHIVE_COLUMNS).eq("id", archive_id).eq("user_id", user_id).execute()
         if result.data and len(result.data) > 0:
             return result.data[0]
         return None
+    except DatastoreError:
+        raise
     except Exception as e:
         logger.error(f"获取档案详情失败: {e}")
         return None
 
 
+@traced
 def create_archive(user_id: str, data: ArchiveCreate) -> dict:
     """
     创建新档案
     """
     try:
-        archive_id = str(uuid.uuid4())
-        
-        archive_data = {
-            "id": archive_id,
-            "user_id": user_id,
-            "title": data.title,
-            "category": data.category,
-            "organization": data.organization or "未知单位",
-            "date": data.date or datetime.now().strftime("%Y-%m-%d"),
-            "status": "pending",
-            "image_url": data.image_url or "",
-            "description": data.description or "",
-        }
-        
-        result = supabase.table("archives").insert(archive_data).execute()
+        archive_data = _build_archive_row(user_id, data)
         
-        if result.data:
-            # 创建提交通知
-            create_notification(
-                user_id=user_id,
-                type_="status",
-                title="申请提交成功",
-                description=f'您的"{data.title}"档案申请已提交，系统正在进行自动审核。'
-            )
-            
-            # 模拟审核通过（实际应用中应该由管理员操作）
-            # 这里简化处理，直接设置为 approved
-            import random
-            if random.random() > 0.2:  # 80% 通过率
-                supabase.table("archives").update({"status": "approved"}).eq("id", archive_id).execute()
-                create_notification(
-                    user_id=user_id,
-                    type_="certificate",
-                    title="审核通过",
-                    description=f'恭喜！您的"{data.title}"已通过审核并正式归档。'
-                )
-            
-            return {"success": True, "data": result.data[0]}
-        else:
+        # 指纹冲突时不写入，直接返回已有档案
+        inserted = _insert_ignoring_duplicates([archive_data])
+        if not inserted:
+            existing = _find_existing_archives(user_id, [archive_data])
+            if existing:
+                return {"success": True, "data": existing[0], "duplicate": True}
             return {"success": False, "error": "创建失败"}
+        
+        # 创建提交通知
+        create_notification(
+            user_id=user_id,
+            type_="status",
+            title="申请提交成功",
+            description=f'您的"{data.title}"档案申请已提交，请耐心等待审核。'
+        )
+        
+        return {"success": True, "data": inserted[0], "duplicate": False}
             
+    except DatastoreError:
+        raise
     except Exception as e:
         logger.error(f"创建档案失败: {e}")
         return {"success": False, "error": str(e)}
 
 
+@traced
 def update_archive(archive_id: str, user_id: str, updates: ArchiveUpdate) -> dict:
     """
     更新档案
@@ -104,40 +140,114 @@ def update_archive(archive_id: str, user_id: str, updates: ArchiveUpdate) -> dic
         if not update_data:
             return {"success": False, "error": "没有要更新的数据"}
         
-        result = supabase.table("archives").update(update_data).eq("id", archive_id).eq("user_id", user_id).execute()
+        result = (
+            supabase.table("archives")
+            .update(update_data)
+            .eq("id", archive_id)
+            .eq("user_id", user_id)
+            .returning(ARCHIVE_COLUMNS)
+            .execute()
+        )
         
         if result.data:
             return {"success": True, "data": result.data[0]}
         else:
             return {"success": False, "error": "更新失败"}
             
+    except DatastoreError:
+        raise
     except Exception as e:
         logger.error(f"更新档案失败: {e}")
         return {"success": False, "error": str(e)}
 
 
+@traced
 def delete_archive(archive_id: str, user_id: str) -> dict:
     """
     删除档案
     """
     try:
-        # 先获取档案信息
-        archive = get_archive_by_id(archive_id, user_id)
-        if not archive:
+        # 删除并返回被删除的行，省去删除前的查询；
+        # 删除通知由数据库触发器 notify_archives_deleted 在同一语句内写入
+        result = supabase.table("archives").delete().eq("id", archive_id).eq("user_id", user_id).returning("id").execute()
+        if not result.data:
             return {"success": False, "error": "档案不存在"}
         
-        result = supabase.table("archives").delete().eq("id", archive_id).eq("user_id", user_id).execute()
+        return {"success": True}
         
-        # 创建删除通知
-        create_notification(
-            user_id=user_id,
-            type_="alert",
-            title="成长数据已删除",
-            description=f'按照您的请求，条目"{archive["title"]}"已从您的时间轴中移除。'
+    except DatastoreError:
+        raise
+    except Exception as e:
+        logger.error(f"删除档案失败: {e}")
+        return {"success": False, "error": str(e)}
+
+
+@traced
+def update_archives_category(archive_ids: List[str], user_id: str, category: str) -> dict:
+    """
+    批量修改档案分类
+    """
+    try:
+        result = (
+            supabase.table("archives")
+            .update({"category": category})
+            .in_("id", archive_ids)
+            .eq("user_id", user_id)
+            .returning(ARCHIVE_COLUMNS)
+            .execute()
         )
+        return {"success": True, "data": result.data or []}
+    except DatastoreError:
+        raise
+    except Exception as e:
+        logger.error(f"批量修改档案分类失败: {e}")
+        return {"success": False, "error": str(e)}
+
+
+@traced
+def delete_archives(archive_ids: List[str], user_id: str) -> dict:
+    """
+    批量删除档案，数据库触发器只生成一条汇总通知
+    """
+    try:
+        result = supabase.table("archives").delete().in_("id", archive_ids).eq("user_id", user_id).returning("id").execute()
+        deleted = result.data or []
         
-        return {"success": True}
+        return {"success": True, "deleted": len(deleted)}
         
+    except DatastoreError:
+        raise
     except Exception as e:
-        logger.error(f"删除档案失败: {e}")
+        logger.error(f"批量删除档案失败: {e}")
+        return {"success": False, "error": str(e)}
+
+
+@traced
+def create_archives(user_id: str, items: List[ArchiveCreate]) -> dict:
+    """
+    批量创建档案，重复提交（含批次内重复）返回已有档案而不再写入
+    """
+    try:
+        rows = [_build_archive_row(user_id, item) for item in items]
+        
+        # ON CONFLICT DO NOTHING 同时跳过与已有档案、与本批次前面条目重复的行
+        inserted = _insert_ignoring_duplicates(rows)
+        inserted_ids = {row["id"] for row in inserted}
+        skipped = [row for row in rows if row["id"] not in inserted_ids]
+        duplicates = _find_existing_archives(user_id, skipped) if skipped else []
+        
+        if inserted:
+            create_notification(
+                user_id=user_id,
+                type_="status",
+                title="申请提交成功",
+                description=f"您的 {len(inserted)} 条档案申请已提交，请耐心等待审核。"
+            )
+        
+        return {"success": True, "created": inserted, "duplicates": duplicates}
+        
+    except DatastoreError:
+        raise
+    except Exception as e:
+        logger.error(f"批量创建档案失败: {e}")
         return {"success": False, "error": str(e)}
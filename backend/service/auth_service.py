@@ -7,7 +7,9 @@ from jose import JWTError, jwt
 from passlib.context import CryptContext
 from config import settings
 from repository.supabase_client import supabase
+from repository.resilient_client import DatastoreError
 from schema.auth import TokenData
+from tracing import traced
 import logging
 
 logger = logging.getLogger(__name__)
@@ -18,16 +20,19 @@ logger = logging.getLogger(__name__)
 pwd_context = CryptContext(schemes=["bcrypt_sha256"], deprecated="auto")
 
 
+@traced
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """验证密码"""
     return pwd_context.verify(plain_password, hashed_password)
 
 
+@traced
 def get_password_hash(password: str) -> str:
     """获取密码哈希"""
     return pwd_context.hash(password)
 
 
+@traced
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """创建访问令牌"""
     to_encode = data.copy()
@@ -40,6 +45,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
+@traced
 def decode_token(token: str) -> Optional[TokenData]:
     """解码令牌"""
     try:
@@ -52,6 +58,7 @@ def decode_token(token: str) -> Optional[TokenData]:
         return None
 
 
+@traced
 def register_user(phone: str, password: str, name: Optional[str] = None) -> dict:
     """
     注册新用户
@@ -59,7 +66,7 @@ def register_user(phone: str, password: str, name: Optional[str] = None) -> dict
     """
     try:
         # 检查用户是否已存在
-        existing = supabase.table("profiles").select("*").eq("phone", phone).execute()
+        existing = supabase.table("profiles").select("id").eq("phone", phone).execute()
         if existing.data and len(existing.data) > 0:
             return {"success": False, "error": "该手机号已注册"}
         
@@ -83,25 +90,28 @@ def register_user(phone: str, password: str, name: Optional[str] = None) -> dict
             "university": "",
         }
         
-        result = supabase.table("profiles").insert(profile_data).execute()
+        result = supabase.table("profiles").insert(profile_data).returning("id").execute()
         
         if result.data:
             return {"success": True, "user_id": user_id}
         else:
             return {"success": False, "error": "注册失败"}
             
+    except DatastoreError:
+        raise
     except Exception as e:
         logger.error(f"注册失败: {e}")
         return {"success": False, "error": str(e)}
 
 
+@traced
 def login_user(phone: str, password: str) -> dict:
     """
     用户登录
     """
     try:
         # 查找用户
-        result = supabase.table("profiles").select("*").eq("phone", phone).execute()
+        result = supabase.table("profiles").select("id, password_hash").eq("phone", phone).execute()
         
         if not result.data or len(result.data) == 0:
             return {"success": False, "error": "用户不存在"}
@@ -122,29 +132,35 @@ def login_user(phone: str, password: str) -> dict:
             "user_id": user["id"]
         }
         
+    except DatastoreError:
+        raise
     except Exception as e:
         logger.error(f"登录失败: {e}")
         return {"success": False, "error": str(e)}
 
 
+@traced
 def get_current_user(token: str) -> Optional[dict]:
     """
-    获取当前用户信息
+    获取当前用户的 id 和角色
     """
     token_data = decode_token(token)
     if token_data is None or token_data.user_id is None:
         return None
     
     try:
-        result = supabase.table("profiles").select("*").eq("id", token_data.user_id).execute()
+        result = supabase.table("profiles").select("id, role").eq("id", token_data.user_id).execute()
         if result.data and len(result.data) > 0:
             return result.data[0]
         return None
+    except DatastoreError:
+        raise
     except Exception as e:
         logger.error(f"获取用户失败: {e}")
         return None
 
 
+@traced
 def delete_user_account(user_id: str) -> dict:
     """
     注销用户账号
@@ -159,8 +175,13 @@ def delete_user_account(user_id: str) -> dict:
         # 删除用户资料
         supabase.table("profiles").delete().eq("id", user_id).execute()
         
+        # 账号已不存在，清理上面删除产生的同步删除标记
+        supabase.table("sync_tombstones").delete().eq("user_id", user_id).execute()
+        
         return {"success": True}
         
+    except DatastoreError:
+        raise
     except Exception as e:
         logger.error(f"注销账号失败: {e}")
         return {"success": False, "error": str(e)}
@@ -0,0 +1,89 @@
+"""
+成长报告 PDF 渲染
+
+在独立进程中执行，只接收可序列化的普通数据
+"""
+from typing import List
+import os
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import mm
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.cidfonts import UnicodeCIDFont
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+FONT_NAME = "STSong-Light"
+
+CATEGORY_ORDER = ["学业", "实践", "奖惩", "证书"]
+
+
+def _styles() -> dict:
+    """报告使用的段落样式"""
+    return {
+        "title": ParagraphStyle("title", fontName=FONT_NAME, fontSize=20, leading=28, alignment=1),
+        "heading": ParagraphStyle("heading", fontName=FONT_NAME, fontSize=14, leading=20, spaceBefore=8, spaceAfter=4),
+        "body": ParagraphStyle("body", fontName=FONT_NAME, fontSize=10, leading=14),
+    }
+
+
+def render_growth_report(profile: dict, archives: List[dict], output_path: str) -> str:
+    """
+    渲染成长报告 PDF 到 output_path，返回文件路径
+    """
+    pdfmetrics.registerFont(UnicodeCIDFont(FONT_NAME))
+    styles = _styles()
+
+    story = [
+        Paragraph("大学生成长档案", styles["title"]),
+        Spacer(1, 6 * mm),
+    ]
+
+    info_rows = [
+        ["姓名", profile.get("name") or "", "学号", profile.get("student_id") or ""],
+        ["学校", profile.get("university") or "", "专业", profile.get("major") or ""],
+        ["年级", profile.get("grade") or "", "档案数", str(len(archives))],
+    ]
+    info_table = Table(info_rows, colWidths=[20 * mm, 65 * mm, 20 * mm, 65 * mm])
+    info_table.setStyle(TableStyle([
+        ("FONTNAME", (0, 0), (-1, -1), FONT_NAME),
+        ("FONTSIZE", (0, 0), (-1, -1), 10),
+        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+        ("BACKGROUND", (0, 0), (0, -1), colors.whitesmoke),
+        ("BACKGROUND", (2, 0), (2, -1), colors.whitesmoke),
+    ]))
+    story.append(info_table)
+
+    # 按分类分组，分类内按日期排序
+    grouped = {}
+    for item in archives:
+        grouped.setdefault(item.get("category") or "其他", []).append(item)
+    categories = [c for c in CATEGORY_ORDER if c in grouped] + sorted(c for c in grouped if c not in CATEGORY_ORDER)
+
+    for category in categories:
+        items = sorted(grouped[category], key=lambda x: x.get("date") or "")
+        story.append(Paragraph(f"{category}（{len(items)}）", styles["heading"]))
+
+        rows = [["日期", "名称", "颁发单位"]]
+        for item in items:
+            rows.append([
+                item.get("date") or "",
+                Paragraph(item.get("title") or "", styles["body"]),
+                Paragraph(item.get("organization") or "", styles["body"]),
+            ])
+        table = Table(rows, colWidths=[25 * mm, 90 * mm, 55 * mm], repeatRows=1)
+        table.setStyle(TableStyle([
+            ("FONTNAME", (0, 0), (-1, -1), FONT_NAME),
+            ("FONTSIZE", (0, 0), (-1, -1), 9),
+            ("GRID", (0, 0), (-1, -1), 0.5, colors.lightgrey),
+            ("BACKGROUND", (0, 0), (-1, 0), colors.whitesmoke),
+            ("VALIGN", (0, 0), (-1, -1), "TOP"),
+        ]))
+        story.append(table)
+
+    # 先写临时文件再改名，避免读到未写完的报告
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    doc = SimpleDocTemplate(tmp_path, pagesize=A4, title="大学生成长档案")
+    doc.build(story)
+    os.replace(tmp_path, output_path)
+    return output_path
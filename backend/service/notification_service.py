@@ -3,24 +3,35 @@
 """
 from typing import List, Optional
 import uuid
+from postgrest.types import ReturnMethod
+from config import settings
 from repository.supabase_client import supabase
+from repository.resilient_client import DatastoreError
+from tracing import traced
 import logging
 
 logger = logging.getLogger(__name__)
 
+# 返回给客户端的通知字段
+NOTIFICATION_COLUMNS = "id, user_id, type, title, description, read, created_at, updated_at"
 
+
+@traced
 def get_notifications(user_id: str) -> List[dict]:
     """
     获取用户的通知列表
     """
     try:
-        result = supabase.table("notifications").select("*").eq("user_id", user_id).order("created_at", desc=True).execute()
+        result = supabase.table("notifications").select(NOTIFICATION_COLUMNS).eq("user_id", user_id).order("created_at", desc=True).execute()
         return result.data or []
+    except DatastoreError:
+        raise
     except Exception as e:
         logger.error(f"获取通知列表失败: {e}")
         return []
 
 
+@traced
 def create_notification(user_id: str, type_: str, title: str, description: str) -> dict:
     """
     创建通知
@@ -37,42 +48,130 @@ def create_notification(user_id: str, type_: str, title: str, description: str)
             "read": False,
         }
         
-        result = supabase.table("notifications").insert(notification_data).execute()
+        result = supabase.table("notifications").insert(notification_data).returning(NOTIFICATION_COLUMNS).execute()
         
         if result.data:
             return {"success": True, "data": result.data[0]}
         else:
             return {"success": False, "error": "创建失败"}
             
+    except DatastoreError:
+        raise
     except Exception as e:
         logger.error(f"创建通知失败: {e}")
         return {"success": False, "error": str(e)}
 
 
+@traced
 def mark_notification_read(notification_id: str, user_id: str) -> dict:
     """
     标记通知已读
     """
     try:
-        result = supabase.table("notifications").update({"read": True}).eq("id", notification_id).eq("user_id", user_id).execute()
+        result = supabase.table("notifications").update({"read": True}).eq("id", notification_id).eq("user_id", user_id).returning("id").execute()
         
         if result.data:
             return {"success": True}
         else:
             return {"success": False, "error": "标记失败"}
             
+    except DatastoreError:
+        raise
     except Exception as e:
         logger.error(f"标记通知已读失败: {e}")
         return {"success": False, "error": str(e)}
 
 
+@traced
+def mark_notifications_read(notification_ids: List[str], user_id: str) -> dict:
+    """
+    批量标记通知已读，只更新未读通知，避免已读通知的 updated_at 变化后被重新同步
+    """
+    try:
+        result = (
+            supabase.table("notifications")
+            .update({"read": True})
+            .in_("id", notification_ids)
+            .eq("user_id", user_id)
+            .eq("read", False)
+            .returning("id")
+            .execute()
+        )
+        return {"success": True, "updated": len(result.data or [])}
+    except DatastoreError:
+        raise
+    except Exception as e:
+        logger.error(f"批量标记通知已读失败: {e}")
+        return {"success": False, "error": str(e)}
+
+
+@traced
 def mark_all_notifications_read(user_id: str) -> dict:
     """
-    标记所有通知已读
+    标记所有通知已读，只更新未读通知，避免整段通知历史被重新同步
     """
     try:
-        result = supabase.table("notifications").update({"read": True}).eq("user_id", user_id).execute()
+        (
+            supabase.table("notifications")
+            .update({"read": True}, returning=ReturnMethod.minimal)
+            .eq("user_id", user_id)
+            .eq("read", False)
+            .execute()
+        )
         return {"success": True}
+    except DatastoreError:
+        raise
     except Exception as e:
         logger.error(f"标记所有通知已读失败: {e}")
         return {"success": False, "error": str(e)}
+
+
+def _run_batched_rpc(function_name: str, params: dict, max_batches: int) -> int:
+    """
+    分批调用存储过程，直到某一批处理行数不足一批或达到批次上限
+    """
+    total = 0
+    for _ in range(max_batches):
+        result = supabase.rpc(function_name, params).execute()
+        affected = result.data or 0
+        total += affected
+        if affected < params["p_batch_size"]:
+            break
+    return total
+
+
+@traced
+def run_notification_retention(
+    older_than_days: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    max_batches: Optional[int] = None,
+) -> dict:
+    """
+    执行通知保留任务：合并重复的已读状态通知，并将已读旧通知分批移入冷表
+    """
+    older_than_days = older_than_days or settings.NOTIFICATION_RETENTION_DAYS
+    batch_size = batch_size or settings.NOTIFICATION_RETENTION_BATCH_SIZE
+    max_batches = max_batches or settings.NOTIFICATION_RETENTION_MAX_BATCHES
+
+    try:
+        compacted = _run_batched_rpc(
+            "compact_status_notifications",
+            {"p_batch_size": batch_size},
+            max_batches,
+        )
+        archived = _run_batched_rpc(
+            "archive_read_notifications",
+            {
+                "p_older_than_days": older_than_days,
+                "p_batch_size": batch_size,
+                "p_move_to_archive": settings.NOTIFICATION_RETENTION_ARCHIVE,
+            },
+            max_batches,
+        )
+        logger.info(f"通知保留任务完成: 合并 {compacted} 条, 归档 {archived} 条")
+        return {"success": True, "compacted": compacted, "archived": archived}
+    except DatastoreError:
+        raise
+    except Exception as e:
+        logger.error(f"通知保留任务失败: {e}")
+        return {"success": False, "error": str(e)}
@@ -0,0 +1,194 @@
+"""
+成长报告服务层
+
+报告在进程池中渲染，文件按"用户 + 档案内容哈希"缓存：
+档案没有变化时再次申请直接返回已生成的文件。
+任务状态保存在缓存目录中，多个工作进程共享。
+"""
+from typing import List, Optional
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from config import settings
+from repository.supabase_client import supabase
+from repository.resilient_client import DatastoreError
+from service import user_service
+from service.growth_report import render_growth_report
+from tracing import traced
+import logging
+
+logger = logging.getLogger(__name__)
+
+REPORT_PROFILE_FIELDS = ("name", "student_id", "grade", "major", "university")
+REPORT_ARCHIVE_FIELDS = "id, title, category, organization, date, updated_at"
+
+_JOB_ID_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    """延迟创建渲染进程池"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=settings.REPORT_WORKERS)
+        return _executor
+
+
+def shutdown_report_pool() -> None:
+    """
+    关闭渲染进程池，等待进行中的渲染完成
+    """
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+
+
+def _user_dir(user_id: str) -> str:
+    path = os.path.join(settings.REPORT_CACHE_DIR, user_id)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _job_paths(user_id: str, job_id: str) -> dict:
+    base = os.path.join(_user_dir(user_id), job_id)
+    return {"pdf": f"{base}.pdf", "running": f"{base}.running", "error": f"{base}.error"}
+
+
+def _report_version(profile: dict, archives: List[dict]) -> str:
+    """根据报告使用的数据计算版本哈希"""
+    payload = {
+        "profile": {field: profile.get(field) for field in REPORT_PROFILE_FIELDS},
+        "archives": [(a["id"], a.get("updated_at")) for a in archives],
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _is_abandoned(marker_path: str) -> bool:
+    """进行中标记超过渲染时限仍未清除，说明渲染进程已退出（如部署或被强制终止）"""
+    try:
+        started_at = os.path.getmtime(marker_path)
+    except FileNotFoundError:
+        return False
+    return time.time() - started_at > settings.REPORT_RENDER_TIMEOUT_SECONDS
+
+
+def _create_marker(marker_path: str) -> bool:
+    """以 O_EXCL 创建进行中标记（写入 pid 和开始时间），已存在返回 False"""
+    try:
+        fd = os.open(marker_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        return False
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump({"pid": os.getpid(), "started_at": time.time()}, f)
+    return True
+
+
+def _remove_old_versions(user_id: str, job_id: str) -> None:
+    """每个用户只保留最新版本的报告，删除其他版本的 PDF 和失败记录"""
+    user_dir = _user_dir(user_id)
+    for name in os.listdir(user_dir):
+        stem, ext = os.path.splitext(name)
+        if stem != job_id and ext in (".pdf", ".error"):
+            _remove(os.path.join(user_dir, name))
+
+
+def _on_render_done(user_id: str, job_id: str, paths: dict, future) -> None:
+    """渲染完成回调：记录失败原因或清理旧版本，并清除进行中标记"""
+    error = future.exception()
+    if error is not None:
+        logger.error(f"渲染成长报告失败: {error}")
+        with open(paths["error"], "w", encoding="utf-8") as f:
+            f.write(str(error))
+    else:
+        _remove_old_versions(user_id, job_id)
+    _remove(paths["running"])
+
+
+@traced
+def submit_report(user_id: str) -> dict:
+    """
+    提交成长报告生成任务，档案未变化时直接返回已缓存的报告
+    """
+    try:
+        profile = user_service.get_user_profile(user_id)
+        if not profile:
+            return {"success": False, "error": "用户资料不存在"}
+
+        result = (
+            supabase.table("archives")
+            .select(REPORT_ARCHIVE_FIELDS)
+            .eq("user_id", user_id)
+            .eq("status", "approved")
+            .order("id")
+            .execute()
+        )
+        archives = result.data or []
+
+        job_id = _report_version(profile, archives)
+        paths = _job_paths(user_id, job_id)
+
+        if os.path.exists(paths["pdf"]):
+            return {"success": True, "data": {"job_id": job_id, "status": "done"}}
+
+        # 清理已退出进程遗留的标记，然后以 O_EXCL 创建标记，保证同一版本只提交一次渲染
+        if _is_abandoned(paths["running"]):
+            logger.warning(f"清理遗留的成长报告任务标记: {paths['running']}")
+            _remove(paths["running"])
+        if not _create_marker(paths["running"]):
+            return {"success": True, "data": {"job_id": job_id, "status": "running"}}
+
+        _remove(paths["error"])
+
+        report_profile = {field: profile.get(field) for field in REPORT_PROFILE_FIELDS}
+        future = _get_executor().submit(render_growth_report, report_profile, archives, paths["pdf"])
+        future.add_done_callback(lambda f: _on_render_done(user_id, job_id, paths, f))
+
+        return {"success": True, "data": {"job_id": job_id, "status": "running"}}
+
+    except DatastoreError:
+        raise
+    except Exception as e:
+        logger.error(f"提交成长报告任务失败: {e}")
+        return {"success": False, "error": str(e)}
+
+
+@traced
+def get_report_status(user_id: str, job_id: str) -> Optional[str]:
+    """
+    获取任务状态：done / running / failed，任务不存在返回 None
+    """
+    if not _JOB_ID_PATTERN.match(job_id):
+        return None
+
+    paths = _job_paths(user_id, job_id)
+    if os.path.exists(paths["pdf"]):
+        return "done"
+    if os.path.exists(paths["running"]):
+        return "failed" if _is_abandoned(paths["running"]) else "running"
+    if os.path.exists(paths["error"]):
+        return "failed"
+    return None
+
+
+@traced
+def get_report_path(user_id: str, job_id: str) -> Optional[str]:
+    """
+    获取已生成报告的文件路径
+    """
+    if get_report_status(user_id, job_id) != "done":
+        return None
+    return _job_paths(user_id, job_id)["pdf"]
@@ -0,0 +1,61 @@
+"""
+审核服务层
+"""
+from typing import List, Optional
+from datetime import datetime, timezone
+from config import settings
+from repository.supabase_client import supabase
+from repository.resilient_client import DatastoreError
+from tracing import traced
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@traced
+def claim_pending_archives(reviewer_id: str, batch_size: Optional[int] = None) -> List[dict]:
+    """
+    领取一批待审核档案（按创建时间排序，已被他人领取的跳过）
+    """
+    try:
+        result = supabase.rpc("claim_pending_archives", {
+            "p_reviewer_id": reviewer_id,
+            "p_batch_size": batch_size or settings.REVIEW_BATCH_SIZE,
+            "p_lease_seconds": settings.REVIEW_LEASE_SECONDS,
+        }).execute()
+        return result.data or []
+    except DatastoreError:
+        raise
+    except Exception as e:
+        logger.error(f"领取待审核档案失败: {e}")
+        return []
+
+
+@traced
+def review_archives(reviewer_id: str, archive_ids: List[str], status: str) -> dict:
+    """
+    批量通过/拒绝已领取的档案
+    单条语句完成更新，状态变更通知由数据库触发器生成
+    """
+    try:
+        now = datetime.now(timezone.utc).isoformat()
+        result = (
+            supabase.table("archives")
+            .update({
+                "status": status,
+                "review_claimed_by": None,
+                "review_claimed_until": None,
+            })
+            .in_("id", archive_ids)
+            .eq("status", "pending")
+            .eq("review_claimed_by", reviewer_id)
+            .gt("review_claimed_until", now)
+            .returning("id")
+            .execute()
+        )
+        return {"success": True, "updated": len(result.data or [])}
+    except DatastoreError:
+        raise
+    except Exception as e:
+        logger.error(f"批量审核失败: {e}")
+        return {"success": False, "error": str(e)}
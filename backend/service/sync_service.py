@@ -0,0 +1,96 @@
+"""
+增量同步服务层
+"""
+from typing import Optional
+from datetime import datetime, timedelta, timezone
+from config import settings
+from repository.supabase_client import supabase
+from service.archive_service import ARCHIVE_COLUMNS
+from service.notification_service import NOTIFICATION_COLUMNS
+from repository.resilient_client import DatastoreError
+from tracing import traced
+import logging
+
+logger = logging.getLogger(__name__)
+
+SYNC_TABLES = {"archives": ARCHIVE_COLUMNS, "notifications": NOTIFICATION_COLUMNS}
+
+
+def _parse_cursor(since: Optional[str]) -> Optional[datetime]:
+    """解析游标（ISO 8601 时间），无效或过期返回 None 表示需要全量同步"""
+    if not since:
+        return None
+    try:
+        cursor = datetime.fromisoformat(since.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if cursor.tzinfo is None:
+        cursor = cursor.replace(tzinfo=timezone.utc)
+
+    # 早于删除标记保留期的游标无法保证拿到全部删除，改为全量同步
+    oldest = datetime.now(timezone.utc) - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+    if cursor < oldest:
+        return None
+    return cursor
+
+
+@traced
+def get_changes(user_id: str, since: Optional[str] = None) -> dict:
+    """
+    获取游标之后的档案与通知变更
+    游标为空、无效或过期时返回全量数据（full = True）
+    """
+    # 下一游标向前回退几秒，覆盖在游标之前开始、之后才提交的事务
+    next_cursor = datetime.now(timezone.utc) - timedelta(seconds=settings.SYNC_CURSOR_SKEW_SECONDS)
+    cursor = _parse_cursor(since)
+
+    try:
+        changes = {
+            # 使用 Z 结尾，避免 "+" 出现在查询参数中
+            "cursor": next_cursor.strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+            "full": cursor is None,
+            "deleted": {table: [] for table in SYNC_TABLES},
+        }
+
+        for table, columns in SYNC_TABLES.items():
+            query = supabase.table(table).select(columns).eq("user_id", user_id)
+            if cursor is not None:
+                query = query.gt("updated_at", cursor.isoformat())
+            result = query.order("updated_at").execute()
+            changes[table] = result.data or []
+
+        if cursor is not None:
+            result = (
+                supabase.table("sync_tombstones")
+                .select("table_name, record_id")
+                .eq("user_id", user_id)
+                .gt("deleted_at", cursor.isoformat())
+                .execute()
+            )
+            for row in result.data or []:
+                if row["table_name"] in changes["deleted"]:
+                    changes["deleted"][row["table_name"]].append(row["record_id"])
+
+        return {"success": True, "data": changes}
+
+    except DatastoreError:
+        raise
+    except Exception as e:
+        logger.error(f"获取增量变更失败: {e}")
+        return {"success": False, "error": str(e)}
+
+
+@traced
+def prune_tombstones() -> dict:
+    """
+    清理超过保留期的删除标记
+    """
+    try:
+        oldest = datetime.now(timezone.utc) - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+        result = supabase.table("sync_tombstones").delete().lt("deleted_at", oldest.isoformat()).execute()
+        return {"success": True, "pruned": len(result.data or [])}
+    except DatastoreError:
+        raise
+    except Exception as e:
+        logger.error(f"清理删除标记失败: {e}")
+        return {"success": False, "error": str(e)}
@@ -3,26 +3,35 @@
 """
 from typing import Optional
 from repository.supabase_client import supabase
+from repository.resilient_client import DatastoreError
 from schema.user import UserProfileUpdate
+from tracing import traced
 import logging
 
 logger = logging.getLogger(__name__)
 
+# 用户资料字段（不含 password_hash，密码只在登录时读取）
+PROFILE_COLUMNS = "id, phone, name, student_id, avatar, grade, major, university, role, created_at, updated_at"
 
+
+@traced
 def get_user_profile(user_id: str) -> Optional[dict]:
     """
     获取用户资料
     """
     try:
-        result = supabase.table("profiles").select("*").eq("id", user_id).execute()
+        result = supabase.table("profiles").select(PROFILE_COLUMNS).eq("id", user_id).execute()
         if result.data and len(result.data) > 0:
             return result.data[0]
         return None
+    except DatastoreError:
+        raise
     except Exception as e:
         logger.error(f"获取用户资料失败: {e}")
         return None
 
 
+@traced
 def update_user_profile(user_id: str, updates: UserProfileUpdate) -> dict:
     """
     更新用户资料
@@ -32,13 +41,21 @@ def update_user_profile(user_id: str, updates: UserProfileUpdate) -> dict:
         if not update_data:
             return {"success": False, "error": "没有要更新的数据"}
         
-        result = supabase.table("profiles").update(update_data).eq("id", user_id).execute()
+        result = (
+            supabase.table("profiles")
+            .update(update_data)
+            .eq("id", user_id)
+            .returning(PROFILE_COLUMNS)
+            .execute()
+        )
         
         if result.data:
             return {"success": True, "data": result.data[0]}
         else:
             return {"success": False, "error": "更新失败"}
             
+    except DatastoreError:
+        raise
     except Exception as e:
         logger.error(f"更新用户资料失败: {e}")
         return {"success": False, "error": str(e)}
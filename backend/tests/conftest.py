@@ -0,0 +1,26 @@
+"""
+测试公共配置：将 backend 目录加入导入路径，并提供本地假 PostgREST 服务
+"""
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+# 导入 main 等模块时需要可用的配置，指向本地地址避免访问真实数据库
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:1")
+os.environ.setdefault("SUPABASE_KEY", "eyJhbGciOiJIUzI1NiJ9.eyJyb2xlIjoiYW5vbiJ9.test")
+
+import pytest  # noqa: E402
+from tests.fake_postgrest import FakePostgrest  # noqa: E402
+
+
+@pytest.fixture
+def fake_postgrest():
+    server = FakePostgrest()
+    server.start()
+    try:
+        yield server
+    finally:
+        server.stop()
@@ -0,0 +1,74 @@
+"""
+本地假 PostgREST 服务
+
+可配置响应的状态码、响应体和延迟，用于在不依赖 Supabase 的情况下
+验证客户端的超时、重试、熔断和降级行为。
+"""
+from typing import Any, List, Optional
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+import time
+
+
+class FakePostgrest:
+    """在随机端口上运行的假 PostgREST 服务"""
+
+    def __init__(self):
+        self.status = 200
+        self.body: Any = []
+        self.latency = 0.0
+        self.requests: List[str] = []
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def respond(self, status: int = 200, body: Any = None, latency: float = 0.0) -> None:
+        """设置后续请求的响应"""
+        with self._lock:
+            self.status = status
+            self.body = [] if body is None else body
+            self.latency = latency
+
+    def start(self) -> None:
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _handle(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    self.rfile.read(length)
+                with fake._lock:
+                    fake.requests.append(f"{self.command} {self.path}")
+                    status, body, latency = fake.status, fake.body, fake.latency
+                if latency:
+                    time.sleep(latency)
+                payload = body if isinstance(body, bytes) else json.dumps(body).encode("utf-8")
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            do_GET = do_POST = do_PATCH = do_DELETE = _handle
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
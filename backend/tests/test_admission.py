@@ -0,0 +1,82 @@
+"""
+准入控制测试
+"""
+import asyncio
+import pytest
+from admission import AdmissionController, AdmissionRejected, Lane, classify
+
+
+def make_controller(max_concurrency=10, queue_timeout=0.2):
+    return AdmissionController(
+        max_concurrency=max_concurrency,
+        queue_timeout=queue_timeout,
+        lanes=[
+            Lane("interactive", 0, max_concurrency, 8),
+            Lane("write", 1, 1, 8),
+            Lane("auth", 2, 1, 8),
+            Lane("heavy", 3, 1, 1),
+        ],
+    )
+
+
+def test_classify():
+    assert classify("GET", "/health") is None
+    assert classify("GET", "/api/notifications") == "interactive"
+    assert classify("POST", "/api/auth/login") == "auth"
+    assert classify("POST", "/api/archives") == "write"
+    assert classify("POST", "/api/reports") == "heavy"
+    assert classify("OPTIONS", "/api/archives") is None
+
+
+def test_waiter_blocked_on_own_lane_does_not_block_others():
+    async def scenario():
+        controller = make_controller()
+        await controller.acquire("write")
+        waiting_write = asyncio.ensure_future(controller.acquire("write"))
+        await asyncio.sleep(0)
+
+        # write 通道已满且有排队，auth 通道空闲时应直接放行
+        assert await controller.acquire("auth") == 0.0
+
+        controller.release("write")
+        await waiting_write
+        assert controller.lanes["write"].active == 1
+
+    asyncio.run(scenario())
+
+
+def test_higher_priority_admitted_first():
+    async def scenario():
+        controller = make_controller(max_concurrency=1, queue_timeout=1)
+        await controller.acquire("interactive")
+        order = []
+
+        async def request(lane):
+            await controller.acquire(lane)
+            order.append(lane)
+            controller.release(lane)
+
+        tasks = [asyncio.ensure_future(request("heavy")), asyncio.ensure_future(request("interactive"))]
+        await asyncio.sleep(0)
+        controller.release("interactive")
+        await asyncio.gather(*tasks)
+        assert order == ["interactive", "heavy"]
+
+    asyncio.run(scenario())
+
+
+def test_rejects_when_queue_full_or_timed_out():
+    async def scenario():
+        controller = make_controller(queue_timeout=0.05)
+        await controller.acquire("heavy")
+        waiting = asyncio.ensure_future(controller.acquire("heavy"))
+        await asyncio.sleep(0)
+
+        with pytest.raises(AdmissionRejected):
+            await controller.acquire("heavy")
+        with pytest.raises(AdmissionRejected):
+            await waiting
+        assert controller.lanes["heavy"].rejected == 2
+        assert controller.active == 1
+
+    asyncio.run(scenario())
@@ -0,0 +1,46 @@
+"""
+群体统计缓存测试
+"""
+from types import SimpleNamespace
+import pytest
+from config import settings
+from repository.resilient_client import StaleCache
+from service import analytics_service
+
+
+class FakeRpc:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, fn, params, read_only=False, stale_ok=False):
+        self.calls += 1
+        return SimpleNamespace(execute=lambda: SimpleNamespace(data=[{"group_key": params["p_group_by"]}]))
+
+
+@pytest.fixture
+def rpc(monkeypatch):
+    fake = FakeRpc()
+    monkeypatch.setattr(analytics_service.supabase, "rpc", fake)
+    monkeypatch.setattr(analytics_service, "_cache", StaleCache(2))
+    return fake
+
+
+def test_cached_until_expiry(rpc, monkeypatch):
+    monkeypatch.setattr(settings, "ANALYTICS_CACHE_SECONDS", 60)
+    analytics_service.get_cohort_stats("major")
+    analytics_service.get_cohort_stats("major")
+    assert rpc.calls == 1
+
+    monkeypatch.setattr(settings, "ANALYTICS_CACHE_SECONDS", 0)
+    analytics_service.get_cohort_stats("grade")
+    assert analytics_service._cache.get(("grade", None, None, None)) is not None
+    analytics_service.get_cohort_stats("grade")
+    assert rpc.calls == 3
+
+
+def test_cache_is_bounded(rpc):
+    for university in ("A", "B", "C"):
+        analytics_service.get_cohort_stats("major", university=university)
+
+    assert len(analytics_service._cache._data) == 2
+    assert analytics_service._cache.get(("major", "A", None, None)) is None
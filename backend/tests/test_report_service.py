@@ -0,0 +1,66 @@
+"""
+成长报告任务状态测试
+"""
+import os
+import time
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from api import reports
+from api.auth import get_current_user_id
+from config import settings
+from service import report_service
+
+JOB_A = "a" * 64
+JOB_B = "b" * 64
+
+
+@pytest.fixture(autouse=True)
+def report_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "REPORT_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "REPORT_RENDER_TIMEOUT_SECONDS", 60)
+    return tmp_path
+
+
+def test_abandoned_marker_reported_as_failed():
+    paths = report_service._job_paths("u1", JOB_A)
+    assert report_service._create_marker(paths["running"])
+    assert report_service.get_report_status("u1", JOB_A) == "running"
+
+    old = time.time() - 120
+    os.utime(paths["running"], (old, old))
+    assert report_service.get_report_status("u1", JOB_A) == "failed"
+    assert report_service._is_abandoned(paths["running"])
+
+
+def test_marker_is_exclusive():
+    paths = report_service._job_paths("u1", JOB_A)
+    assert report_service._create_marker(paths["running"])
+    assert not report_service._create_marker(paths["running"])
+
+
+def test_only_latest_version_is_kept():
+    old_paths = report_service._job_paths("u1", JOB_A)
+    new_paths = report_service._job_paths("u1", JOB_B)
+    for path in (old_paths["pdf"], old_paths["error"], new_paths["pdf"]):
+        open(path, "w").close()
+
+    report_service._remove_old_versions("u1", JOB_B)
+
+    assert not os.path.exists(old_paths["pdf"])
+    assert not os.path.exists(old_paths["error"])
+    assert report_service.get_report_status("u1", JOB_B) == "done"
+
+
+def test_rejects_invalid_job_id():
+    assert report_service.get_report_status("u1", "../etc/passwd") is None
+
+
+def test_reports_unavailable_when_disabled(monkeypatch):
+    app = FastAPI()
+    app.include_router(reports.router)
+    app.dependency_overrides[get_current_user_id] = lambda: "u1"
+    monkeypatch.setattr(settings, "REPORTS_ENABLED", False)
+
+    response = TestClient(app).post("/reports")
+    assert response.status_code == 503
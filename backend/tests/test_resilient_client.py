@@ -0,0 +1,193 @@
+"""
+容错客户端测试（基于本地假 PostgREST 服务）
+"""
+import threading
+import time
+import pytest
+from postgrest.exceptions import APIError
+from supabase import create_client
+from supabase.lib.client_options import ClientOptions
+from repository.resilient_client import (
+    CallGuard,
+    CircuitBreaker,
+    DatastoreOverloaded,
+    DatastoreUnavailable,
+    ResilientClient,
+    StaleCache,
+)
+
+TEST_KEY = "eyJhbGciOiJIUzI1NiJ9.eyJyb2xlIjoiYW5vbiJ9.test"
+
+
+def make_client(url, timeout=2.0, deadline=3.0, retries=2, threshold=5, max_in_flight=8, reset=60):
+    options = ClientOptions(postgrest_client_timeout=timeout)
+    guard = CallGuard(
+        deadline_seconds=deadline,
+        max_retries=retries,
+        retry_base_seconds=0.01,
+        breaker=CircuitBreaker(threshold, reset_seconds=reset),
+        max_in_flight=max_in_flight,
+        stale_cache=StaleCache(16, max_bytes=4096),
+    )
+    return ResilientClient(create_client(url, TEST_KEY, options=options), guard)
+
+
+def select_archives(client):
+    return client.table("archives").select("*").eq("user_id", "u1").execute()
+
+
+def test_postgrest_connection_error_is_transient(fake_postgrest):
+    fake_postgrest.respond(503, {"code": "PGRST001", "message": "Database client error"})
+    client = make_client(fake_postgrest.url, threshold=10)
+
+    with pytest.raises(DatastoreUnavailable):
+        select_archives(client)
+
+    # 1 次调用 + 2 次重试
+    assert len(fake_postgrest.requests) == 3
+    assert client.guard.breaker._failures == 3
+
+
+def test_non_json_5xx_is_transient(fake_postgrest):
+    fake_postgrest.respond(502, b"bad gateway")
+    client = make_client(fake_postgrest.url, retries=0)
+
+    with pytest.raises(DatastoreUnavailable):
+        select_archives(client)
+
+
+def test_client_error_is_not_retried(fake_postgrest):
+    fake_postgrest.respond(400, {"code": "42703", "message": "column does not exist"})
+    client = make_client(fake_postgrest.url)
+
+    with pytest.raises(APIError):
+        select_archives(client)
+
+    assert len(fake_postgrest.requests) == 1
+    assert client.guard.breaker.state == "closed"
+
+
+def select_archives_stale_ok(client):
+    return client.table("archives").select("*").eq("user_id", "u1").stale_ok().execute()
+
+
+def test_serves_stale_data_when_backend_fails(fake_postgrest):
+    fake_postgrest.respond(200, [{"id": "a1"}])
+    client = make_client(fake_postgrest.url)
+    assert select_archives_stale_ok(client).data == [{"id": "a1"}]
+
+    fake_postgrest.respond(503, {"code": "PGRST000", "message": "Could not connect"})
+    assert select_archives_stale_ok(client).data == [{"id": "a1"}]
+
+
+def test_reads_without_opt_in_never_serve_stale(fake_postgrest):
+    fake_postgrest.respond(200, [{"id": "a1"}])
+    client = make_client(fake_postgrest.url, retries=0)
+    assert select_archives(client).data == [{"id": "a1"}]
+
+    fake_postgrest.respond(503, {"code": "PGRST000", "message": "Could not connect"})
+    with pytest.raises(DatastoreUnavailable):
+        select_archives(client)
+
+
+def test_large_results_are_not_cached(fake_postgrest):
+    fake_postgrest.respond(200, [{"id": "a1", "image_url": "data:image/png;base64," + "A" * 8192}])
+    client = make_client(fake_postgrest.url, retries=0)
+    select_archives_stale_ok(client)
+
+    fake_postgrest.respond(503, {"code": "PGRST000", "message": "Could not connect"})
+    with pytest.raises(DatastoreUnavailable):
+        select_archives_stale_ok(client)
+
+
+def test_stale_cache_evicts_by_bytes():
+    cache = StaleCache(10, max_bytes=100)
+    cache.put(("a",), "a", 60)
+    cache.put(("b",), "b", 60)
+    assert cache.get(("a",)) is None
+    assert cache.get(("b",)) == "b"
+
+    cache.put(("c",), "c", 101)
+    assert cache.get(("c",)) is None
+    assert cache.get(("b",)) == "b"
+
+
+def test_breaker_opens_and_fails_fast(fake_postgrest):
+    fake_postgrest.respond(503, {"code": "PGRST002", "message": "schema cache"})
+    client = make_client(fake_postgrest.url, retries=0, threshold=2)
+
+    for _ in range(2):
+        with pytest.raises(DatastoreUnavailable):
+            select_archives(client)
+    assert client.guard.breaker.state == "open"
+
+    sent = len(fake_postgrest.requests)
+    with pytest.raises(DatastoreUnavailable):
+        select_archives(client)
+    assert len(fake_postgrest.requests) == sent
+
+
+def test_writes_are_not_retried(fake_postgrest):
+    fake_postgrest.respond(503, {"code": "PGRST001", "message": "Database client error"})
+    client = make_client(fake_postgrest.url)
+
+    with pytest.raises(DatastoreUnavailable):
+        client.table("archives").insert({"id": "a1"}).execute()
+
+    assert len(fake_postgrest.requests) == 1
+
+
+def test_deadline_bounds_total_time(fake_postgrest):
+    fake_postgrest.respond(200, [], latency=2.0)
+    client = make_client(fake_postgrest.url, timeout=1.5, deadline=0.5, retries=3)
+
+    start = time.monotonic()
+    with pytest.raises(DatastoreUnavailable):
+        select_archives(client)
+    assert time.monotonic() - start < 1.0
+
+
+def test_sheds_load_over_in_flight_limit(fake_postgrest):
+    fake_postgrest.respond(200, [], latency=0.5)
+    client = make_client(fake_postgrest.url, max_in_flight=1)
+
+    slow = threading.Thread(target=select_archives, args=(client,))
+    slow.start()
+    time.sleep(0.1)
+    try:
+        with pytest.raises(DatastoreOverloaded):
+            client.table("archives").insert({"id": "a1"}).execute()
+    finally:
+        slow.join()
+
+
+def test_shed_call_does_not_consume_half_open_trial(fake_postgrest):
+    fake_postgrest.respond(503, {"code": "PGRST000", "message": "Could not connect"})
+    client = make_client(fake_postgrest.url, retries=0, threshold=1, max_in_flight=1, reset=0.1)
+    with pytest.raises(DatastoreUnavailable):
+        client.table("archives").insert({"id": "a1"}).execute()
+    time.sleep(0.2)
+    assert client.guard.breaker.state == "half-open"
+
+    # 并发名额被占满时到达的调用被限流，不应占用试探名额
+    client.guard._in_flight.acquire()
+    try:
+        with pytest.raises(DatastoreOverloaded):
+            client.table("archives").insert({"id": "a2"}).execute()
+    finally:
+        client.guard._in_flight.release()
+
+    fake_postgrest.respond(201, [{"id": "a3"}])
+    assert client.table("archives").insert({"id": "a3"}).execute().data == [{"id": "a3"}]
+    assert client.guard.breaker.state == "closed"
+
+
+def test_returning_limits_written_columns(fake_postgrest):
+    fake_postgrest.respond(200, [{"id": "a1"}])
+    client = make_client(fake_postgrest.url)
+
+    client.table("archives").update({"category": "学业"}).eq("id", "a1").returning("id").execute()
+
+    method, path = fake_postgrest.requests[0].split(" ", 1)
+    assert method == "PATCH"
+    assert "select=id" in path
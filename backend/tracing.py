@@ -0,0 +1,204 @@
+"""
+轻量级请求追踪
+
+中间件为每个请求分配 request id 并按采样率决定是否记录；
+服务层函数和数据库调用在请求内形成嵌套 span，
+请求结束后整条链路导出到本地文件或 OTLP/HTTP 收集器。
+"""
+from typing import Any, Callable, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+import functools
+import json
+import random
+import secrets
+import threading
+import time
+import httpx
+from config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Span:
+    """一次调用的耗时记录"""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "attributes", "start_ns", "end_ns", "error")
+
+    def __init__(self, trace_id: str, parent_id: Optional[str], name: str, attributes: Dict[str, Any]):
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.error: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "attributes": self.attributes,
+            "start_ns": self.start_ns,
+            "duration_ms": round(((self.end_ns or self.start_ns) - self.start_ns) / 1e6, 3),
+            "error": self.error,
+        }
+
+
+class Trace:
+    """一个请求内收集的全部 span"""
+
+    def __init__(self, request_id: str, sampled: bool):
+        self.request_id = request_id
+        self.trace_id = secrets.token_hex(16)
+        self.sampled = sampled
+        self.spans: List[Span] = []
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def get_request_id() -> Optional[str]:
+    """当前请求的 request id，请求外返回 None"""
+    trace = _current_trace.get()
+    return trace.request_id if trace else None
+
+
+@contextmanager
+def start_trace(request_id: Optional[str] = None):
+    """开始一个请求级追踪，结束时导出已采样的链路"""
+    sampled = settings.TRACE_SAMPLE_RATE > 0 and random.random() < settings.TRACE_SAMPLE_RATE
+    trace = Trace(request_id or secrets.token_hex(8), sampled)
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+        if trace.sampled and trace.spans:
+            export(trace)
+
+
+@contextmanager
+def span(name: str, **attributes: Any):
+    """记录一个嵌套 span；不在已采样的请求内时不做任何事"""
+    trace = _current_trace.get()
+    if trace is None or not trace.sampled:
+        yield None
+        return
+
+    parent = _current_span.get()
+    current = Span(trace.trace_id, parent.span_id if parent else None, name, attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        current.end_ns = time.time_ns()
+        _current_span.reset(token)
+        trace.spans.append(current)
+
+
+def set_attributes(**attributes: Any) -> None:
+    """给当前 span 补充属性；不在已采样的请求内时不做任何事"""
+    current = _current_span.get()
+    if current is not None:
+        current.attributes.update(attributes)
+
+
+def traced(func: Callable) -> Callable:
+    """将函数调用记录为 span，名称为 模块.函数名"""
+    name = f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with span(name):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+# ============ 导出 ============
+
+_export_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="trace-export")
+_file_lock = threading.Lock()
+
+
+def _export_file(trace: Trace) -> None:
+    with _file_lock, open(settings.TRACE_FILE, "a", encoding="utf-8") as f:
+        for item in trace.spans:
+            record = item.to_dict()
+            record["request_id"] = trace.request_id
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def _otlp_value(value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _export_otlp(trace: Trace) -> None:
+    spans = []
+    for item in trace.spans:
+        attributes = dict(item.attributes, request_id=trace.request_id)
+        otlp_span = {
+            "traceId": item.trace_id,
+            "spanId": item.span_id,
+            "name": item.name,
+            "kind": 2 if item.parent_id is None else 1,
+            "startTimeUnixNano": str(item.start_ns),
+            "endTimeUnixNano": str(item.end_ns or item.start_ns),
+            "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in attributes.items()],
+            "status": {"code": 2, "message": item.error} if item.error else {"code": 1},
+        }
+        if item.parent_id:
+            otlp_span["parentSpanId"] = item.parent_id
+        spans.append(otlp_span)
+
+    payload = {
+        "resourceSpans": [{
+            "resource": {"attributes": [
+                {"key": "service.name", "value": {"stringValue": settings.TRACE_SERVICE_NAME}},
+            ]},
+            "scopeSpans": [{"scope": {"name": "czda.tracing"}, "spans": spans}],
+        }]
+    }
+    httpx.post(settings.TRACE_OTLP_ENDPOINT, json=payload, timeout=5).raise_for_status()
+
+
+_EXPORTERS = {"file": _export_file, "otlp": _export_otlp}
+
+
+def _export_safely(exporter: Callable[[Trace], None], trace: Trace) -> None:
+    try:
+        exporter(trace)
+    except Exception as e:
+        logger.warning(f"导出追踪数据失败: {e}")
+
+
+def export(trace: Trace) -> None:
+    """在后台线程导出链路，不阻塞请求"""
+    exporter = _EXPORTERS.get(settings.TRACE_EXPORTER)
+    if exporter is None:
+        return
+    try:
+        _export_executor.submit(_export_safely, exporter, trace)
+    except RuntimeError:
+        pass
+
+
+def shutdown_exporter() -> None:
+    """等待已排队的链路导出完成"""
+    _export_executor.shutdown(wait=True)
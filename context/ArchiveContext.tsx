@@ -262,7 +262,6 @@ export const ArchiveProvider: React.FC<{ children: ReactNode }> = ({ children })
     if (updates.category !== undefined) apiUpdates.category = updates.category;
     if (updates.organization !== undefined) apiUpdates.organization = updates.organization;
     if (updates.date !== undefined) apiUpdates.date = updates.date;
-    if (updates.status !== undefined) apiUpdates.status = updates.status;
     if (updates.imageUrl !== undefined) apiUpdates.image_url = updates.imageUrl;
     if (updates.description !== undefined) apiUpdates.description = updates.description;
 
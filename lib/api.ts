@@ -197,7 +197,6 @@ export interface ArchiveUpdate {
   category?: string;
   organization?: string;
   date?: string;
-  status?: 'approved' | 'pending' | 'rejected';
   image_url?: string;
   description?: string;
 }